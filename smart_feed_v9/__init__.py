@@ -6,24 +6,62 @@ operating costs by intelligently blending complementary waste streams.
 
 Usage:
     from smart_feed_v9 import WasteStream, SystemConfig, run_optimization
+
+`search` and `gatekeeper` are imported eagerly: both are also submodule
+names, and importing a submodule binds it on the package, so a lazy
+function export of the same name could be replaced by its module. The
+remaining computation API (blending, baseline, reporter) is imported on
+first access. Numba is imported only when a search uses the compiled
+kernel, so `import smart_feed_v9` costs NumPy but never Numba.
 """
 
+import importlib
+
 from .models import (
     WasteStream,
     SystemConfig,
     BlendProperties,
     PhaseResult,
+    CostBreakdown,
     Schedule,
 )
-from .blending import blend_linear, blend_pH, calc_blend_properties
 from .gatekeeper import gatekeeper, calc_throughput, calc_phase_cost
-from .baseline import calc_baseline
 from .search import search, build_optimized_schedule
-from .reporter import full_report
+
+# Lazily re-exported names → defining submodule (PEP 562)
+_LAZY_EXPORTS = {
+    "blend_linear": ".blending",
+    "blend_pH": ".blending",
+    "calc_blend_properties": ".blending",
+    "calc_baseline": ".baseline",
+    "full_report": ".reporter",
+    "format_report": ".reporter",
+}
+
+__all__ = [
+    "WasteStream", "SystemConfig", "BlendProperties", "PhaseResult",
+    "CostBreakdown", "Schedule", "gatekeeper", "calc_throughput",
+    "calc_phase_cost", "search", "build_optimized_schedule",
+    "run_optimization", *_LAZY_EXPORTS,
+]
+
+
+def __getattr__(name: str):
+    """Import a lazily re-exported name on first access and cache it"""
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
 
 
 def run_optimization(streams: list, cfg: SystemConfig = None,
-                     verbose: bool = True) -> dict:
+                     verbose: bool = True, out=None) -> dict:
     """
     Run the complete optimization pipeline.
 
@@ -31,6 +69,7 @@ def run_optimization(streams: list, cfg: SystemConfig = None,
         streams: list[WasteStream] — user-provided waste inventory
         cfg: SystemConfig — tunable parameters (None uses all defaults)
         verbose: whether to print the full report
+        out: text stream the report is written to (None → sys.stdout)
 
     Returns:
         dict with keys:
@@ -39,6 +78,9 @@ def run_optimization(streams: list, cfg: SystemConfig = None,
             stats: search statistics
             savings_pct: float
     """
+    from .baseline import calc_baseline
+    from .reporter import full_report
+
     if cfg is None:
         cfg = SystemConfig()
 
@@ -53,7 +95,7 @@ def run_optimization(streams: list, cfg: SystemConfig = None,
 
     # Step 7: Report
     if verbose:
-        full_report(streams, cfg, baseline, optimized, stats)
+        full_report(streams, cfg, baseline, optimized, stats, out=out)
 
     savings_pct = 0.0
     if optimized and baseline.total_cost > 0:
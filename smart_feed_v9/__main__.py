@@ -18,14 +18,24 @@ See input/example_input.json for format reference.
 """
 
 import argparse
-import io
+import dataclasses
 import json
 import os
 import sys
 import time
 from datetime import datetime
 
+from typing import get_type_hints
+
 from . import WasteStream, SystemConfig, run_optimization
+from .reporter import format_report
+
+# Override converters: SystemConfig field → declared type (float / int),
+# resolved once at import (get_type_hints also handles string annotations)
+_FIELD_TYPES = {
+    name: tp for name, tp in get_type_hints(SystemConfig).items()
+    if name in {f.name for f in dataclasses.fields(SystemConfig)}
+}
 
 
 # ═══════════════════════════════════════════════════════════════
@@ -121,17 +131,17 @@ def build_config(cli_args: dict, json_overrides: dict = None) -> SystemConfig:
         overrides.update(json_overrides)
 
     # CLI overrides (only non-None values)
-    config_fields = {f.name for f in SystemConfig.__dataclass_fields__.values()}
     for key, val in cli_args.items():
-        if val is not None and key in config_fields:
+        if val is not None and key in _FIELD_TYPES:
             overrides[key] = val
 
-    # Apply overrides
-    for key, val in overrides.items():
-        if hasattr(cfg, key):
-            setattr(cfg, key, type(getattr(cfg, key))(val))
-
-    return cfg
+    # Apply overrides (SystemConfig is frozen → build one replaced copy)
+    converted = {
+        key: _FIELD_TYPES[key](val)
+        for key, val in overrides.items()
+        if key in _FIELD_TYPES
+    }
+    return dataclasses.replace(cfg, **converted)
 
 
 def main():
@@ -221,26 +231,14 @@ Examples:
     print(f"\n⏳ Optimizing feed plan for {len(streams)} waste streams...")
     t0 = time.time()
 
-    # Tee: output to both terminal and buffer for saving report file
-    report_buf = io.StringIO()
-    _real_stdout = sys.stdout
-
-    class _Tee:
-        def __init__(self, *targets):
-            self.targets = targets
-        def write(self, data):
-            for t in self.targets:
-                t.write(data)
-        def flush(self):
-            for t in self.targets:
-                t.flush()
-
-    sys.stdout = _Tee(_real_stdout, report_buf)
-    result = run_optimization(streams, cfg, verbose=True)
+    # Report is built in memory once, then shown and saved from the same string
+    result = run_optimization(streams, cfg, verbose=False)
+    report = format_report(streams, cfg, result["baseline"],
+                           result["optimized"], result["stats"])
     elapsed = time.time() - t0
-    print(f"\n  ⏱ Computation time: {elapsed:.2f}s")
-    print(f"  💰 Cost savings: {result['savings_pct']:.1f}%")
-    sys.stdout = _real_stdout
+    report += (f"\n  ⏱ Computation time: {elapsed:.2f}s\n"
+               f"  💰 Cost savings: {result['savings_pct']:.1f}%\n")
+    sys.stdout.write(report)
 
     # ── Save report to report/ directory ──
     pkg_dir = os.path.dirname(os.path.abspath(__file__))
@@ -251,7 +249,7 @@ Examples:
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     report_path = os.path.join(report_dir, f"report_{timestamp}.txt")
     with open(report_path, "w", encoding="utf-8") as f:
-        f.write(report_buf.getvalue())
+        f.write(report)
 
     print(f"\n  📄 Report saved: {report_path}")
 
@@ -0,0 +1,82 @@
+"""
+AxNano Smart-Feed Algorithm v9 — Scalar Gatekeeper Helpers
+===========================================================
+Plain-Python scalar functions for the Gatekeeper math on unpacked floats
+(no dataclasses), shared by the scalar adapters in gatekeeper.py and the
+baseline. They are not compiled: the search evaluates templates as NumPy
+batches (gatekeeper.evaluate_phases_batch), so these only run a handful of
+times per optimization (baseline streams, final plan phases).
+
+Helpers take scalars in a fixed order; see gatekeeper.gatekeeper_params()
+for the packed SystemConfig tuple.
+"""
+
+
+def _pos(x):
+    """max(0.0, x) as a conditional expression: no builtin call.
+    Same result for NaN and -0.0."""
+    return x if x > 0.0 else 0.0
+
+
+def r_water(solid_pct, salt_ppm, solid_max_pct, salt_max_ppm):
+    """Step A: water demand = max(r_solid, r_salt)"""
+    r_solid = _pos(solid_pct / solid_max_pct - 1.0)
+    r_salt = _pos(salt_ppm / salt_max_ppm - 1.0)
+    return r_salt if r_salt > r_solid else r_solid
+
+
+def r_diesel(btu_per_lb, r_water, BTU_target, BTU_diesel, eta):
+    """Step B: diesel demand on water-diluted BTU_eff"""
+    BTU_eff = btu_per_lb / (1.0 + r_water)
+    return _pos((BTU_target - BTU_eff) / (BTU_diesel * eta))
+
+
+def r_naoh(f_ppm, pH, K_F_TO_ACID, K_PH_TO_BASE, K_ACID_TO_NAOH_VOL):
+    """Step C: NaOH demand = net acid gap × NaOH volume per meq"""
+    acid_load = f_ppm * K_F_TO_ACID
+    base_load = _pos(pH - 7.0) * K_PH_TO_BASE
+    return _pos(acid_load - base_load) * K_ACID_TO_NAOH_VOL
+
+
+def throughput(r_water, r_diesel, r_naoh, F_total):
+    """Synchronous equation «A2»: W = F_total / (1 + r_ext)"""
+    r_ext = r_water + r_diesel + r_naoh
+    return F_total / (1.0 + r_ext)
+
+
+def gatekeeper_rates(btu_per_lb, pH, f_ppm, solid_pct, salt_ppm,
+                     solid_max_pct, salt_max_ppm, BTU_target, BTU_diesel,
+                     eta, K_F_TO_ACID, K_PH_TO_BASE, K_ACID_TO_NAOH_VOL,
+                     F_total):
+    """
+    Fused Gatekeeper + throughput: (r_water, r_diesel, r_naoh, W)
+
+    Blend properties first, then the 9 packed config scalars.
+    """
+    rw = r_water(solid_pct, salt_ppm, solid_max_pct, salt_max_ppm)
+    rd = r_diesel(btu_per_lb, rw, BTU_target, BTU_diesel, eta)
+    rn = r_naoh(f_ppm, pH, K_F_TO_ACID, K_PH_TO_BASE, K_ACID_TO_NAOH_VOL)
+    return rw, rd, rn, throughput(rw, rd, rn, F_total)
+
+
+def phase_cost(Q_phase, r_water, r_diesel, r_naoh, runtime_min,
+               cost_diesel_per_L, cost_naoh_per_L, cost_water_per_L,
+               P_system, cost_electricity_per_kWh, cost_labor_per_hr):
+    """
+    5 cost components + total:
+    (diesel, naoh, water, electricity, labor, total)
+
+    Material volume = W × r × runtime_min = Q_phase × r (runtime = Q/W),
+    so W drops out; only electricity and labor need the runtime.
+    """
+    runtime_hr = runtime_min / 60.0
+
+    cost_diesel = Q_phase * r_diesel * cost_diesel_per_L
+    cost_naoh = Q_phase * r_naoh * cost_naoh_per_L
+    cost_water = Q_phase * r_water * cost_water_per_L
+    cost_electricity = P_system * runtime_hr * cost_electricity_per_kWh
+    cost_labor = runtime_hr * cost_labor_per_hr
+
+    return (cost_diesel, cost_naoh, cost_water, cost_electricity, cost_labor,
+            cost_diesel + cost_naoh + cost_water
+            + cost_electricity + cost_labor)
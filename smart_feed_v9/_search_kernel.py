@@ -0,0 +1,259 @@
+"""
+AxNano Smart-Feed Algorithm v9 — Compiled Search Kernel
+========================================================
+The _search recursion of search.py on flat arrays, compiled with Numba.
+Only imported when Numba is available (see search.HAVE_NUMBA) and the
+search is large enough to repay the import (search._COMPILED_MIN_STREAMS);
+otherwise search.py runs its NumPy-vectorized Python recursion instead.
+
+Same algorithm, same float operations in the same order as the Python
+recursion — plans, costs and search stats are identical:
+  - streams are columns 0..N-1 (sorted stream ids), inventory is a
+    float64 array mutated in place and restored after each branch
+  - templates are rows of the (T, N) table from search._template_table;
+    the usable rows for each active-stream bitmask (2^N sets, ≤ 64 at
+    MAX_KEY_STREAMS) are listed once up front, as the Python path's
+    usable_cache does lazily
+  - memo key: rounded liters per column (half-to-even, 0 = depleted),
+    _KEY_BITS each, packed three columns per int64 into a pair of words
+    (hashing two ints instead of a 5-tuple); memo value: (sub_cost,
+    template row, num_batches, child key) — the plan is read back by
+    following the child keys from the root, instead of storing phases.
+    Only used while every stream fits the key (≤ MAX_KEY_STREAMS
+    columns of ≤ MAX_KEY_L liters each) — beyond that, keys would
+    overflow and collide.
+  - fastmath stays off: reassociation would make compiled and Python
+    results differ in the last bits, and the memo rounds inventory to
+    whole liters, so results must not depend on the environment
+  - the recursion runs on an explicit per-depth stack (depth ≤ N + 1):
+    Numba cannot cache compiled recursive functions, and an uncached
+    compile would cost seconds on every run.
+"""
+
+import numpy as np
+from numba import njit, types
+from numba.typed import Dict
+
+_ACTIVE_THRESHOLD_L = 0.5
+_INF = np.inf
+
+# Memo key: columns 0-2 in the first word, 3-5 in the second (3 × 21 bits)
+_KEY_BITS = 21
+_WORD_STREAMS = 3
+MAX_KEY_L = (1 << _KEY_BITS) - 1
+MAX_KEY_STREAMS = 2 * _WORD_STREAMS
+
+_KEY = types.UniTuple(types.int64, 2)
+_ENTRY = types.Tuple((types.float64, types.int64, types.float64, _KEY))
+
+
+_ENTER, _RETURN, _ADVANCE = 0, 1, 2
+
+
+@njit(cache=True)
+def _memo_key(inv):
+    """Rounded liters per stream (0 = depleted), packed into two words"""
+    lo = 0
+    hi = 0
+    for j in range(inv.shape[0]):
+        v = 0
+        if inv[j] > _ACTIVE_THRESHOLD_L:
+            v = round(inv[j])
+        if j < _WORD_STREAMS:
+            lo = (lo << _KEY_BITS) | v
+        else:
+            hi = (hi << _KEY_BITS) | v
+    return (lo, hi)
+
+
+@njit(cache=True)
+def run_search(qty, tmpl_ratios, tmpl_uses, tmpl_cost_per_batch,
+               tmpl_sum_ratios, lb_cost_per_L):
+    """
+    Full search from inventory `qty` (columns in sorted stream-id order).
+
+    Args:
+        lb_cost_per_L: $/L lower bound on remaining volume (PRUNE 3)
+
+    Returns:
+        (best_cost, plan_rows, plan_batches, pruned_bound, memo_hits)
+        plan_rows / plan_batches: template row and num_batches per phase
+    """
+    N = qty.shape[0]
+    T = tmpl_ratios.shape[0]
+    L = N + 2  # depths 0..N+1 (BOUND 3 returns at depth N + 1)
+
+    # Usable template rows per active-stream bitmask (bit j = column j),
+    # in template order: a template is usable when its stream mask has
+    # no bit outside the active mask. 2^N lists (≤ 64: N ≤ MAX_KEY_STREAMS),
+    # built once.
+    n_masks = 1 << N
+    tmpl_mask = np.zeros(T, dtype=np.int64)
+    for t in range(T):
+        for j in range(N):
+            if tmpl_uses[t, j]:
+                tmpl_mask[t] |= 1 << j
+    usable_start = np.zeros(n_masks + 1, dtype=np.int64)
+    usable_rows = np.empty(n_masks * T, dtype=np.int64)
+    n_usable = 0
+    for a in range(n_masks):
+        usable_start[a] = n_usable
+        for t in range(T):
+            if tmpl_mask[t] & ~a == 0:
+                usable_rows[n_usable] = t
+                n_usable += 1
+    usable_start[n_masks] = n_usable
+
+    memo = Dict.empty(key_type=_KEY, value_type=_ENTRY)
+    pruned_bound = 0
+    memo_hits = 0
+    inv = qty.copy()
+
+    # Per-depth frame: candidates, loop position, node state, best so far
+    rows = np.empty((L, T), dtype=np.int64)
+    batches = np.empty((L, T), dtype=np.float64)
+    costs = np.empty((L, T), dtype=np.float64)
+    order = np.empty((L, T), dtype=np.int64)
+    n_cand = np.zeros(L, dtype=np.int64)
+    pos = np.zeros(L, dtype=np.int64)
+    keys = [(0, 0)] * L
+    node_qty = np.empty((L, N), dtype=np.float64)
+    excess = np.empty(L, dtype=np.float64)
+    pending_cost = np.empty(L, dtype=np.float64)
+    best = np.empty(L, dtype=np.float64)
+    best_t = np.empty(L, dtype=np.int64)
+    best_nb = np.empty(L, dtype=np.float64)
+    best_child = [(0, 0)] * L
+
+    d = 0
+    keys[0] = _memo_key(inv)
+    state = _ENTER
+    ret = 0.0
+    while True:
+        if state == _ENTER:
+            n_active = 0
+            active_mask = 0
+            for j in range(N):
+                if inv[j] > _ACTIVE_THRESHOLD_L:
+                    n_active += 1
+                    active_mask |= 1 << j
+
+            # Terminal: all inventory depleted / BOUND 3 / memo hit
+            done = True
+            if active_mask == 0:
+                ret = 0.0
+            elif d > N:
+                ret = _INF
+            elif keys[d] in memo:
+                memo_hits += 1
+                ret = memo[keys[d]][0]
+            else:
+                done = False
+            if done:
+                if d == 0:
+                    break
+                d -= 1
+                state = _RETURN
+                continue
+
+            # ── Candidates: usable templates, in template order ──
+            m = 0
+            for u in range(usable_start[active_mask],
+                           usable_start[active_mask + 1]):
+                t = usable_rows[u]
+                nb = _INF
+                for j in range(N):
+                    if tmpl_uses[t, j]:
+                        v = inv[j] / tmpl_ratios[t, j]
+                        if v < nb:
+                            nb = v
+                rows[d, m] = t
+                batches[d, m] = nb
+                costs[d, m] = nb * tmpl_cost_per_batch[t]
+                m += 1
+
+            # Volume above the depletion threshold, in column order
+            x = 0.0
+            for j in range(N):
+                if inv[j] > _ACTIVE_THRESHOLD_L:
+                    x += inv[j]
+            excess[d] = x - _ACTIVE_THRESHOLD_L * n_active
+
+            # Sort by cost ascending (stable) — explore cheapest first
+            order[d, :m] = np.argsort(costs[d, :m], kind="mergesort")
+            n_cand[d] = m
+            pos[d] = 0
+            node_qty[d] = inv
+            best[d] = _INF
+            best_t[d] = -1
+            best_nb[d] = 0.0
+            state = _ADVANCE
+
+        elif state == _RETURN:
+            # Child of frame d finished with cost `ret`: undo, compare
+            inv[:] = node_qty[d]
+            total_from_here = pending_cost[d] + ret
+            if total_from_here < best[d]:
+                best[d] = total_from_here
+                k = order[d, pos[d] - 1]
+                best_t[d] = rows[d, k]
+                best_nb[d] = batches[d, k]
+                best_child[d] = keys[d + 1]
+            state = _ADVANCE
+
+        # _ADVANCE: next unpruned candidate of frame d, or finish the node
+        m = n_cand[d]
+        i = pos[d]
+        pushed = False
+        while i < m:
+            k = order[d, i]
+            cost_total = costs[d, k]
+
+            # PRUNE 2: first exceed after sorting means break
+            if cost_total >= best[d]:
+                pruned_bound += m - i
+                i = m
+                break
+
+            # PRUNE 3: phase cost + LB(remaining volume)
+            t = rows[d, k]
+            num_batches = batches[d, k]
+            remaining_L = excess[d] - tmpl_sum_ratios[t] * num_batches
+            if cost_total + remaining_L * lb_cost_per_L >= best[d]:
+                pruned_bound += 1
+                i += 1
+                continue
+
+            for j in range(N):
+                if tmpl_uses[t, j]:
+                    inv[j] = node_qty[d, j] - tmpl_ratios[t, j] * num_batches
+            keys[d + 1] = _memo_key(inv)
+            pending_cost[d] = cost_total
+            pos[d] = i + 1
+            d += 1
+            state = _ENTER
+            pushed = True
+            break
+        if pushed:
+            continue
+
+        # Node done: cache its optimum (inf / no template if none found)
+        memo[keys[d]] = (best[d], best_t[d], best_nb[d], best_child[d])
+        ret = best[d]
+        if d == 0:
+            break
+        d -= 1
+        state = _RETURN
+
+    # Follow the memo chain from the root (depleted state: no entry)
+    plan_rows = np.empty(N + 1, dtype=np.int64)
+    plan_batches = np.empty(N + 1, dtype=np.float64)
+    n = 0
+    key = keys[0]
+    while ret < _INF and key in memo and n < N + 1:
+        entry = memo[key]
+        plan_rows[n] = entry[1]
+        plan_batches[n] = entry[2]
+        n += 1
+        key = entry[3]
+    return ret, plan_rows[:n], plan_batches[:n], pruned_bound, memo_hits
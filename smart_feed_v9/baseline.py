@@ -13,9 +13,8 @@ from .models import (
     WasteStream, SystemConfig, BlendProperties,
     PhaseResult, Schedule,
 )
-from .gatekeeper import (
-    gatekeeper, calc_throughput, calc_phase_cost,
-)
+from .gatekeeper import gatekeeper_params, calc_phase_cost
+from . import _kernels
 
 
 def calc_baseline(streams: list, cfg: SystemConfig) -> Schedule:
@@ -27,6 +26,9 @@ def calc_baseline(streams: list, cfg: SystemConfig) -> Schedule:
     the value of blending optimization.
     """
     phases = []
+    total_cost = 0.0
+    total_runtime_min = 0.0
+    gk_params = gatekeeper_params(cfg)
 
     for stream in streams:
         # Single stream = its own properties are the "blend" properties
@@ -38,19 +40,21 @@ def calc_baseline(streams: list, cfg: SystemConfig) -> Schedule:
             salt_ppm=stream.salt_ppm,
         )
 
-        r_water, r_diesel, r_naoh = gatekeeper(blend, cfg)
+        r_water, r_diesel, r_naoh, W = _kernels.gatekeeper_rates(
+            blend.btu_per_lb, blend.pH, blend.f_ppm,
+            blend.solid_pct, blend.salt_ppm, *gk_params
+        )
         r_ext = r_water + r_diesel + r_naoh
-        W = calc_throughput(r_water, r_diesel, r_naoh, cfg)
 
         # No W_min floor — allow very low throughput to produce very high cost
         runtime_min = stream.quantity_L / W if W > 0 else float("inf")
 
         costs = calc_phase_cost(
-            W, r_water, r_diesel, r_naoh, runtime_min, cfg
+            stream.quantity_L, r_water, r_diesel, r_naoh, runtime_min, cfg
         )
 
-        phases.append(PhaseResult(
-            streams={stream.stream_id: 1},
+        phase = PhaseResult(
+            streams=((stream.stream_id, 1),),
             blend_props=blend,
             r_water=r_water,
             r_diesel=r_diesel,
@@ -59,11 +63,21 @@ def calc_baseline(streams: list, cfg: SystemConfig) -> Schedule:
             W=W,
             runtime_min=runtime_min,
             Q_phase=stream.quantity_L,
-            **costs,
-        ))
+            cost_diesel=costs.diesel,
+            cost_naoh=costs.naoh,
+            cost_water=costs.water,
+            cost_electricity=costs.electricity,
+            cost_labor=costs.labor,
+            cost_total=costs.total,
+        )
+        phases.append(phase)
+
+        # Totals accumulated in the same loop (same order as sum())
+        total_cost += phase.cost_total
+        total_runtime_min += phase.runtime_min
 
     return Schedule(
         phases=phases,
-        total_cost=sum(p.cost_total for p in phases),
-        total_runtime_min=sum(p.runtime_min for p in phases),
+        total_cost=total_cost,
+        total_runtime_min=total_runtime_min,
     )
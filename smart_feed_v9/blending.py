@@ -3,10 +3,15 @@ AxNano Smart-Feed Algorithm v9 — Blend Property Calculations
 =============================================================
 - Linear blending: BTU, F ppm, Solid%, Salt ppm «A4»
 - pH blending: [H⁺] concentration method (chemically correct)
+- Batch variant: all ratios for one stream subset at once (NumPy),
+  over per-stream columns prepared once ([H⁺] precomputed)
 """
 
 import math
-from .models import WasteStream, BlendProperties
+
+import numpy as np
+
+from .models import WasteStream, BlendProperties, COL_PH, COL_QTY
 
 
 def blend_linear(values: list, ratios: list) -> float:
@@ -52,13 +57,86 @@ def calc_blend_properties(
 
     BTU, F ppm, Solid%, Salt: linear weighted average «A4»
     pH: [H⁺] concentration mixing method
+
+    One pass over the streams accumulates all five weighted sums; each
+    sum adds terms in the same order blend_linear / blend_pH do.
     """
-    ratio_list = list(ratios)
+    total = sum(ratios)
+    if total == 0:
+        return BlendProperties(btu_per_lb=0.0, pH=7.0, f_ppm=0.0,
+                               solid_pct=0.0, salt_ppm=0.0)
+
+    btu = h = f = solid = salt = 0
+    for s, r in zip(streams, ratios):
+        btu += s.btu_per_lb * r
+        h += (10.0 ** (-s.pH)) * r
+        f += s.f_ppm * r
+        solid += s.solid_pct * r
+        salt += s.salt_ppm * r
 
+    h /= total
     return BlendProperties(
-        btu_per_lb=blend_linear([s.btu_per_lb for s in streams], ratio_list),
-        pH=blend_pH([s.pH for s in streams], ratio_list),
-        f_ppm=blend_linear([s.f_ppm for s in streams], ratio_list),
-        solid_pct=blend_linear([s.solid_pct for s in streams], ratio_list),
-        salt_ppm=blend_linear([s.salt_ppm for s in streams], ratio_list),
+        btu_per_lb=btu / total,
+        pH=-math.log10(h) if h > 0 else 14.0,  # h ≤ 0: extremely alkaline
+        f_ppm=f / total,
+        solid_pct=solid / total,
+        salt_ppm=salt / total,
     )
+
+
+def stream_matrix(streams: list) -> np.ndarray:
+    """
+    Stack streams into one SoA property matrix, shape (n_streams, 6),
+    columns in PROPERTY_COLUMNS order (see WasteStream.to_array).
+    """
+    return np.vstack([s.to_array() for s in streams])
+
+
+def prepare_blend_matrix(props: np.ndarray) -> np.ndarray:
+    """
+    Blend-ready per-stream columns, shape (n_streams, 5): the property
+    matrix without quantity, with pH replaced by [H⁺] = 10^(-pH).
+
+    Computed once per run, so [H⁺] is not re-derived for every subset.
+    """
+    values = props[:, :COL_QTY].copy()
+    values[:, COL_PH] = 10.0 ** (-values[:, COL_PH])
+    return values
+
+
+def blend_prepared(prepared: np.ndarray, ratios: np.ndarray) -> np.ndarray:
+    """
+    Blend many ratios over prepare_blend_matrix() rows.
+
+    Weighted sums accumulate stream by stream, in the same order as
+    blend_linear, rather than via a matmul (BLAS may reorder the sum).
+    """
+    ratios = np.asarray(ratios, dtype=np.float64)
+
+    blend = ratios[:, :1] * prepared[0]
+    for j in range(1, len(prepared)):
+        blend += ratios[:, j:j + 1] * prepared[j]
+    blend /= ratios.sum(axis=1)[:, None]
+
+    h_blend = blend[:, COL_PH]
+    with np.errstate(divide="ignore"):
+        blend[:, COL_PH] = np.where(h_blend > 0, -np.log10(h_blend), 14.0)
+    return blend
+
+
+def calc_blend_properties_batch(props: np.ndarray,
+                                ratios: np.ndarray) -> np.ndarray:
+    """
+    Vectorized calc_blend_properties over many ratios for the same streams.
+
+    Args:
+        props: Stream property matrix (n_streams, 6), see stream_matrix()
+        ratios: int array of shape (n_ratios, n_streams)
+
+    Returns:
+        float64 matrix (n_ratios, 5): blended btu_per_lb, pH, f_ppm,
+        solid_pct, salt_ppm (PROPERTY_COLUMNS order, COL_* indices)
+
+    pH is blended as [H⁺] = 10^(-pH), then converted back.
+    """
+    return blend_prepared(prepare_blend_matrix(props), ratios)
@@ -6,9 +6,47 @@ and derives throughput W and phase cost.
 
 ★ Computation order is critical: r_water → BTU_eff → r_diesel → r_naoh
   This guarantees a single-pass solution with no circular dependencies.
+
+The scalar arithmetic lives in _kernels.py;
+the functions here are thin adapters over BlendProperties / SystemConfig.
 """
 
-from .models import BlendProperties, SystemConfig, PhaseResult
+import numpy as np
+
+from .models import BlendProperties, SystemConfig, PhaseResult, CostBreakdown
+from .blending import calc_blend_properties, blend_prepared
+from . import _kernels
+
+
+def gatekeeper_params(cfg: SystemConfig) -> tuple:
+    """
+    Pack the 9 SystemConfig scalars used by the Gatekeeper kernels.
+
+    Extracted once per baseline / search run so the hot loop passes
+    plain floats instead of reading config attributes per candidate.
+
+    Order: (solid_max_pct, salt_max_ppm, BTU_target, BTU_diesel, eta,
+            K_F_TO_ACID, K_PH_TO_BASE, K_ACID_TO_NAOH_VOL, F_total)
+    """
+    return (
+        cfg.solid_max_pct, cfg.salt_max_ppm,
+        cfg.BTU_target, cfg.BTU_diesel, cfg.eta,
+        cfg.K_F_TO_ACID, cfg.K_PH_TO_BASE, cfg.K_ACID_TO_NAOH_VOL,
+        cfg.F_total,
+    )
+
+
+def cost_params(cfg: SystemConfig) -> tuple:
+    """
+    Pack the 6 SystemConfig scalars used by the phase-cost kernel.
+
+    Order: (cost_diesel_per_L, cost_naoh_per_L, cost_water_per_L,
+            P_system, cost_electricity_per_kWh, cost_labor_per_hr)
+    """
+    return (
+        cfg.cost_diesel_per_L, cfg.cost_naoh_per_L, cfg.cost_water_per_L,
+        cfg.P_system, cfg.cost_electricity_per_kWh, cfg.cost_labor_per_hr,
+    )
 
 
 def calc_r_water(blend: BlendProperties, cfg: SystemConfig) -> float:
@@ -25,9 +63,8 @@ def calc_r_water(blend: BlendProperties, cfg: SystemConfig) -> float:
     Proof: If r_solid ≥ r_salt, then salt_after = salt_ppm/(1+r_solid)
            ≤ salt_ppm/(1+r_salt) = salt_max_ppm ✓  Symmetric for the reverse.
     """
-    r_solid = max(0.0, blend.solid_pct / cfg.solid_max_pct - 1.0)
-    r_salt = max(0.0, blend.salt_ppm / cfg.salt_max_ppm - 1.0)
-    return max(r_solid, r_salt)
+    return _kernels.r_water(blend.solid_pct, blend.salt_ppm,
+                            cfg.solid_max_pct, cfg.salt_max_ppm)
 
 
 def calc_r_diesel(blend: BlendProperties, r_water: float,
@@ -38,9 +75,8 @@ def calc_r_diesel(blend: BlendProperties, r_water: float,
     All water addition (whether from Solid% or Salt) dilutes BTU.
     BTU_eff = BTU_blend / (1 + r_water)
     """
-    BTU_eff = blend.btu_per_lb / (1.0 + r_water)
-    return max(0.0,
-               (cfg.BTU_target - BTU_eff) / (cfg.BTU_diesel * cfg.eta))
+    return _kernels.r_diesel(blend.btu_per_lb, r_water,
+                             cfg.BTU_target, cfg.BTU_diesel, cfg.eta)
 
 
 def calc_r_naoh(blend: BlendProperties, cfg: SystemConfig) -> float:
@@ -52,19 +88,14 @@ def calc_r_naoh(blend: BlendProperties, cfg: SystemConfig) -> float:
     - Base load: alkaline waste (pH > 7) provides internal base contribution
     - NaOH fills the net acid gap
 
+    acid_load = f_ppm × K_F_TO_ACID                   (meq/L waste)
+    base_load = max(0, pH - 7) × K_PH_TO_BASE         (meq/L waste)
+    r_naoh    = max(0, acid - base) × K_ACID_TO_NAOH_VOL
+
     All K constants are user-tunable.
     """
-    # Acid load (meq/L waste)
-    acid_load = blend.f_ppm * cfg.K_F_TO_ACID
-
-    # Base load (meq/L waste) — only when blend pH > 7 has internal base contribution
-    base_load = max(0.0, (blend.pH - 7.0)) * cfg.K_PH_TO_BASE
-
-    # Net acid gap
-    net_acid = max(0.0, acid_load - base_load)
-
-    # NaOH volume demand (L NaOH / L waste)
-    return net_acid * cfg.K_ACID_TO_NAOH_VOL
+    return _kernels.r_naoh(blend.f_ppm, blend.pH, cfg.K_F_TO_ACID,
+                           cfg.K_PH_TO_BASE, cfg.K_ACID_TO_NAOH_VOL)
 
 
 def gatekeeper(blend: BlendProperties, cfg: SystemConfig) -> tuple:
@@ -74,9 +105,10 @@ def gatekeeper(blend: BlendProperties, cfg: SystemConfig) -> tuple:
     Strict computation order: r_water → r_diesel → r_naoh
     Returns: (r_water, r_diesel, r_naoh)
     """
-    r_water = calc_r_water(blend, cfg)
-    r_diesel = calc_r_diesel(blend, r_water, cfg)
-    r_naoh = calc_r_naoh(blend, cfg)
+    r_water, r_diesel, r_naoh, _ = _kernels.gatekeeper_rates(
+        blend.btu_per_lb, blend.pH, blend.f_ppm,
+        blend.solid_pct, blend.salt_ppm, *gatekeeper_params(cfg)
+    )
     return r_water, r_diesel, r_naoh
 
 
@@ -89,35 +121,87 @@ def calc_throughput(r_water: float, r_diesel: float, r_naoh: float,
 
     No circular dependency, single-pass solution.
     """
-    r_ext = r_water + r_diesel + r_naoh
-    return cfg.F_total / (1.0 + r_ext)
+    return _kernels.throughput(r_water, r_diesel, r_naoh, cfg.F_total)
 
 
-def calc_phase_cost(W: float, r_water: float, r_diesel: float,
+def calc_phase_cost(Q_phase: float, r_water: float, r_diesel: float,
                     r_naoh: float, runtime_min: float,
-                    cfg: SystemConfig) -> dict:
+                    cfg: SystemConfig) -> CostBreakdown:
     """
-    Compute the 5 cost components for a single phase.
+    Compute the 5 cost components (+ total) for a single phase.
 
     Internal units: minutes → converted to hours for electricity and labor.
-    Material costs: flow_rate(L/min) × ratio × time(min) = volume(L) × unit_price($/L)
+    Material costs: waste volume(L) × ratio × unit_price($/L)
+      (= flow_rate W × ratio × runtime, since runtime = Q_phase / W)
     """
-    runtime_hr = runtime_min / 60.0
+    return CostBreakdown(*_kernels.phase_cost(
+        Q_phase, r_water, r_diesel, r_naoh, runtime_min, *cost_params(cfg)
+    ))
 
-    cost_diesel = W * r_diesel * runtime_min * cfg.cost_diesel_per_L
-    cost_naoh = W * r_naoh * runtime_min * cfg.cost_naoh_per_L
-    cost_water = W * r_water * runtime_min * cfg.cost_water_per_L
-    cost_electricity = cfg.P_system * runtime_hr * cfg.cost_electricity_per_kWh
-    cost_labor = runtime_hr * cfg.cost_labor_per_hr
+
+def evaluate_phases_batch(prepared: np.ndarray, ratios: np.ndarray,
+                          cfg: SystemConfig) -> dict:
+    """
+    Vectorized blend → Gatekeeper → throughput → cost rate for all ratios
+    of one stream subset (inventory-independent part of evaluate_phase).
+
+    Same formulas as the scalar kernels, applied as NumPy ops over the
+    whole ratio array: one pass per step instead of one call per ratio.
+
+    Args:
+        prepared: Blend-ready rows of the subset's streams
+                  (blending.prepare_blend_matrix)
+        ratios: int array of shape (n_ratios, n_streams)
+
+    Returns:
+        dict with
+            blend: (n_ratios, 5) blended properties
+                   (see blending.calc_blend_properties_batch)
+        and arrays of shape (n_ratios,):
+            r_water, r_diesel, r_naoh, W,
+            cost_per_batch: phase cost = num_batches × cost_per_batch,
+            feasible: pH ≤ pH_max and W ≥ W_min
+    """
+    ratios = np.asarray(ratios)
+    blend = blend_prepared(prepared, ratios)
+    btu, pH, f_ppm, solid, salt = blend.T
+
+    # Gatekeeper: r_water → r_diesel → r_naoh
+    # (clamps run in place on fresh temporaries: no extra allocations)
+    r_solid = solid / cfg.solid_max_pct - 1.0
+    r_salt = salt / cfg.salt_max_ppm - 1.0
+    np.maximum(r_solid, 0.0, out=r_solid)
+    np.maximum(r_salt, 0.0, out=r_salt)
+    r_water = np.maximum(r_solid, r_salt, out=r_solid)
+    BTU_eff = btu / (1.0 + r_water)
+    r_diesel = (cfg.BTU_target - BTU_eff) / (cfg.BTU_diesel * cfg.eta)
+    np.maximum(r_diesel, 0.0, out=r_diesel)
+    base_load = pH - 7.0
+    np.maximum(base_load, 0.0, out=base_load)
+    r_naoh = f_ppm * cfg.K_F_TO_ACID - base_load * cfg.K_PH_TO_BASE
+    np.maximum(r_naoh, 0.0, out=r_naoh)
+    r_naoh *= cfg.K_ACID_TO_NAOH_VOL
+
+    W = cfg.F_total / (1.0 + (r_water + r_diesel + r_naoh))
+
+    # Cost rate per batch (see search._precompute_templates derivation)
+    fixed_cost_per_min = (
+        cfg.P_system * cfg.cost_electricity_per_kWh + cfg.cost_labor_per_hr
+    ) / 60.0
+    material_cost_per_min = W * (
+        r_diesel * cfg.cost_diesel_per_L
+        + r_naoh * cfg.cost_naoh_per_L
+        + r_water * cfg.cost_water_per_L
+    )
+    cost_per_batch = (ratios.sum(axis=1) / W
+                      * (material_cost_per_min + fixed_cost_per_min))
 
     return {
-        "cost_diesel": cost_diesel,
-        "cost_naoh": cost_naoh,
-        "cost_water": cost_water,
-        "cost_electricity": cost_electricity,
-        "cost_labor": cost_labor,
-        "cost_total": cost_diesel + cost_naoh + cost_water
-                      + cost_electricity + cost_labor,
+        "blend": blend,
+        "r_water": r_water, "r_diesel": r_diesel, "r_naoh": r_naoh,
+        "W": W,
+        "cost_per_batch": cost_per_batch,
+        "feasible": (pH <= cfg.pH_max) & (W >= cfg.W_min),
     }
 
 
@@ -128,8 +212,6 @@ def evaluate_phase(streams: list, ratios: tuple, inventory: dict,
 
     Returns None if infeasible (W < W_min or pH > pH_max).
     """
-    from .blending import calc_blend_properties
-
     stream_ids = [s.stream_id for s in streams]
     blend = calc_blend_properties(streams, ratios)
     # pH upper bound check: overly alkaline mixtures cannot be processed
@@ -137,30 +219,41 @@ def evaluate_phase(streams: list, ratios: tuple, inventory: dict,
     if blend.pH > cfg.pH_max:
         return None
 
-    r_water, r_diesel, r_naoh = gatekeeper(blend, cfg)
+    # Gatekeeper rates and W from one scalar helper call
+    r_water, r_diesel, r_naoh, W = _kernels.gatekeeper_rates(
+        blend.btu_per_lb, blend.pH, blend.f_ppm,
+        blend.solid_pct, blend.salt_ppm, *gatekeeper_params(cfg)
+    )
     r_ext = r_water + r_diesel + r_naoh
-    W = calc_throughput(r_water, r_diesel, r_naoh, cfg)
 
     if W < cfg.W_min:
         return None  # Throughput too low, infeasible
 
     # Compute phase duration
     # num_batches = min(Q_i / ratio_i) — the first-exhausted stream determines phase length
-    num_batches = min(
-        inventory[sid] / ratio
-        for sid, ratio in zip(stream_ids, ratios)
-    )
+    # (plain loop: no generator / zip objects)
+    num_batches = inventory[stream_ids[0]] / ratios[0]
+    for i in range(1, len(stream_ids)):
+        n = inventory[stream_ids[i]] / ratios[i]
+        if n < num_batches:
+            num_batches = n
     Q_phase = sum(r * num_batches for r in ratios)
     runtime_min = Q_phase / W
 
-    costs = calc_phase_cost(W, r_water, r_diesel, r_naoh, runtime_min, cfg)
+    costs = calc_phase_cost(Q_phase, r_water, r_diesel, r_naoh, runtime_min,
+                            cfg)
 
     return PhaseResult(
-        streams=dict(zip(stream_ids, ratios)),
+        streams=tuple(zip(stream_ids, ratios)),
         blend_props=blend,
         r_water=r_water, r_diesel=r_diesel, r_naoh=r_naoh,
         r_ext=r_ext, W=W,
         runtime_min=runtime_min,
         Q_phase=Q_phase,
-        **costs,
+        cost_diesel=costs.diesel,
+        cost_naoh=costs.naoh,
+        cost_water=costs.water,
+        cost_electricity=costs.electricity,
+        cost_labor=costs.labor,
+        cost_total=costs.total,
     )
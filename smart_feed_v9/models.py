@@ -5,17 +5,26 @@ WasteStream:     User-provided waste properties (no defaults)
 SystemConfig:    All tunable parameters (with defaults, user-adjustable)
 BlendProperties: Intermediate calculation results
 PhaseResult:     Complete result for a single phase
+CostBreakdown:   Itemized phase cost (returned by calc_phase_cost)
 Schedule:        Complete feed plan (multiple phases)
 """
 
 from dataclasses import dataclass, field
+from typing import NamedTuple
+
+
+# Column layout of WasteStream.to_array() / stream property matrices (SoA).
+# The first 5 columns are also the layout of blended-property matrices.
+PROPERTY_COLUMNS = ("btu_per_lb", "pH", "f_ppm", "solid_pct", "salt_ppm",
+                    "quantity_L")
+COL_BTU, COL_PH, COL_F, COL_SOLID, COL_SALT, COL_QTY = range(6)
 
 
 # ═══════════════════════════════════════════════════════════════
 # User-provided — properties for each waste stream
 # ═══════════════════════════════════════════════════════════════
 
-@dataclass
+@dataclass(slots=True)
 class WasteStream:
     """
     A single waste stream. All fields are user-provided, no defaults.
@@ -30,18 +39,28 @@ class WasteStream:
     salt_ppm: float         # Salt concentration (ppm)
     moisture_pct: float     # Moisture (%), display only «A9», not used in calculations
 
+    def to_array(self):
+        """Numeric properties as a float64 np.ndarray, PROPERTY_COLUMNS order"""
+        import numpy as np  # Deferred: keeps `import smart_feed_v9` light
+        return np.array([self.btu_per_lb, self.pH, self.f_ppm,
+                         self.solid_pct, self.salt_ppm, self.quantity_L],
+                        dtype=np.float64)
+
 
 # ═══════════════════════════════════════════════════════════════
 # All tunable parameters — with defaults, user-adjustable
 # ═══════════════════════════════════════════════════════════════
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class SystemConfig:
     """
     System configuration. All parameters have defaults based on AxNano
     operational data; users can adjust based on specific equipment and
     operating conditions.
 
+    Frozen and slotted: attribute reads are slot loads, and a config
+    cannot change mid-run. Derive variants with dataclasses.replace().
+
     Grouped into five categories:
     1. Reactor parameters
     2. Reactor boundary conditions
@@ -95,9 +114,13 @@ class SystemConfig:
 # Intermediate results and output structures
 # ═══════════════════════════════════════════════════════════════
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class BlendProperties:
-    """Blended waste properties (intermediate calculation result)"""
+    """
+    Blended waste properties (intermediate calculation result).
+    Frozen: one instance is shared by a template and every phase built
+    from it.
+    """
     btu_per_lb: float       # Linear weighted average
     pH: float               # [H⁺] concentration mixing then converted back
     f_ppm: float            # Linear weighted average
@@ -105,10 +128,20 @@ class BlendProperties:
     salt_ppm: float         # Linear weighted average
 
 
-@dataclass
+class CostBreakdown(NamedTuple):
+    """Itemized phase cost ($) — a tuple, so no per-call dict allocation"""
+    diesel: float
+    naoh: float
+    water: float
+    electricity: float
+    labor: float
+    total: float
+
+
+@dataclass(frozen=True, slots=True)
 class PhaseResult:
     """Complete result for a single phase"""
-    streams: dict               # {stream_id: ratio_part}, e.g. {"Resin": 1, "AFFF": 3}
+    streams: tuple              # ((stream_id, ratio_part), ...), e.g. (("Resin", 1), ("AFFF", 3))
     blend_props: BlendProperties
     r_water: float              # Water demand rate (L water / L waste)
     r_diesel: float             # Diesel demand rate (L diesel / L waste)
@@ -117,16 +150,16 @@ class PhaseResult:
     W: float                    # Waste throughput (L/min)
     runtime_min: float          # Runtime (minutes)
     Q_phase: float              # Total waste consumed in this phase (L)
-    # Itemized costs
-    cost_diesel: float = 0.0
-    cost_naoh: float = 0.0
-    cost_water: float = 0.0
-    cost_electricity: float = 0.0
-    cost_labor: float = 0.0
-    cost_total: float = 0.0
+    # Itemized costs (always supplied — see calc_phase_cost)
+    cost_diesel: float
+    cost_naoh: float
+    cost_water: float
+    cost_electricity: float
+    cost_labor: float
+    cost_total: float
 
 
-@dataclass
+@dataclass(slots=True)
 class Schedule:
     """Complete feed plan"""
     phases: list                # list[PhaseResult]
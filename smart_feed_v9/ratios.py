@@ -11,50 +11,87 @@ Bounds:
 Note: (1,2) and (2,1) are considered different ratios (more A vs more B)
 """
 
-from math import gcd
-from functools import reduce
-from itertools import product
+from dataclasses import fields
+from functools import lru_cache
 
+import numpy as np
 
-def generate_ratios(n_streams: int, max_sum: int) -> list:
+from .models import SystemConfig
+
+
+@lru_cache(maxsize=None)
+def generate_ratios(n_streams: int, max_sum: int) -> tuple:
     """
     Generate all valid ratios for n_streams components.
 
+    Memoized on (n_streams, max_sum) — the result is a pure function of
+    both, so repeated searches never re-enumerate.
+
     Args:
         n_streams: Number of waste streams in the blend (1-5)
         max_sum: Max sum of ratio parts, default 11 (= F_total rounded)
 
     Returns:
-        list of tuple[int, ...]: All valid ratios
+        tuple of tuple[int, ...]: All valid ratios
 
     Example:
         generate_ratios(2, 11) →
-        [(1,1), (1,2), (2,1), (1,3), (3,1), (2,3), (3,2), ...]
+        ((1,1), (1,2), (1,3), ..., (2,1), (2,3), ...)
     """
     if n_streams == 1:
-        return [(1,)]  # Single stream has only one ratio
+        return ((1,),)  # Single stream has only one ratio
+
+    return tuple(map(tuple, generate_ratio_array(n_streams, max_sum).tolist()))
+
+
+@lru_cache(maxsize=None)
+def generate_ratio_array(n_streams: int, max_sum: int) -> np.ndarray:
+    """
+    Vectorized generate_ratios: all valid ratios as one int16 array.
+
+    Builds the full Cartesian grid with np.indices, then applies both
+    bounds as array masks: sum ≤ max_sum first, then np.gcd.reduce along
+    each row only for the survivors. Rows are in lexicographic order.
+
+    Memoized on (n_streams, max_sum); the cached array is read-only.
+    int16 holds any ratio part (≤ max_sum) and halves the table versus
+    int32; sums along rows promote to the default int, so they can't wrap.
 
-    results = []
+    Returns:
+        np.ndarray of shape (n_ratios, n_streams), dtype int16 (C-contiguous)
+    """
     upper = max_sum - n_streams + 1  # Max value for a single component
+    if upper < 1:
+        return np.empty((0, n_streams), dtype=np.int16)
+
+    grid = np.indices((upper,) * n_streams, dtype=np.int16)
+    grid = grid.reshape(n_streams, -1).T + 1
 
-    for combo in product(range(1, upper + 1), repeat=n_streams):
-        if sum(combo) > max_sum:
-            continue
-        if reduce(gcd, combo) != 1:
-            continue
-        results.append(combo)
+    grid = grid[grid.sum(axis=1) <= max_sum]
+    ratios = np.ascontiguousarray(grid[np.gcd.reduce(grid, axis=1) == 1])
+    ratios.flags.writeable = False  # Shared via the cache
+    return ratios
 
-    return results
 
+# ─── Cache warm-up ───
+# Default ratio_sum_max × 1–5 streams covers every run with default
+# SystemConfig; fill generate_ratio_array's cache once at import (~1 ms
+# vectorized), so searches only hit it.
+_DEFAULT_MAX_SUM = next(f.default for f in fields(SystemConfig)
+                        if f.name == "ratio_sum_max")
+_MAX_STREAMS = 5
+for _n in range(1, _MAX_STREAMS + 1):
+    generate_ratio_array(_n, _DEFAULT_MAX_SUM)
+del _n
 
-# ─── Pre-computed statistics ───
 
-def ratio_stats(max_streams: int = 5, max_sum: int = 11) -> dict:
+def ratio_stats(max_streams: int = _MAX_STREAMS,
+                max_sum: int = _DEFAULT_MAX_SUM) -> dict:
     """
     Compute ratio counts for each stream count, used to estimate search space.
+    Cache hits for the defaults (warmed at import, see above).
     """
-    stats = {}
-    for n in range(1, max_streams + 1):
-        ratios = generate_ratios(n, max_sum)
-        stats[n] = len(ratios)
-    return stats
+    return {
+        n: len(generate_ratio_array(n, max_sum))
+        for n in range(1, max_streams + 1)
+    }
@@ -2,10 +2,18 @@
 AxNano Smart-Feed Algorithm v9 — Report Output
 ================================================
 Step 7: Format and output optimal plan, cost comparison, safety boundary report.
+
+Section functions print to `out` (default: stdout); format_report renders
+them all into one buffer, so the full report costs a single write.
 """
 
+import io
+import sys
+
 from .models import WasteStream, SystemConfig, Schedule, PhaseResult
 
+_INF = float("inf")
+
 
 def _fmt_cost(val: float) -> str:
     if val >= 1_000_000:
@@ -14,7 +22,7 @@ def _fmt_cost(val: float) -> str:
 
 
 def _fmt_time(minutes: float) -> str:
-    if minutes == float("inf"):
+    if minutes == _INF:
         return "∞"
     if minutes >= 60:
         return f"{minutes / 60:.1f} hr"
@@ -28,159 +36,180 @@ def _fmt_rate(val: float) -> str:
 
 
 def _pct_change(baseline: float, optimized: float) -> str:
-    if baseline == 0 or baseline == float("inf"):
+    if baseline == 0 or baseline == _INF:
         return "N/A"
+    if optimized == baseline:
+        return "+0.0%"  # same text f"{0.0:+.1f}%" gives
     pct = (optimized - baseline) / baseline * 100
     return f"{pct:+.1f}%"
 
 
-def print_separator(char: str = "═", width: int = 72):
-    print(char * width)
+def _print_lines(lines: list, out=None):
+    """Print a block of pre-formatted lines as one string (no-op if empty)"""
+    if lines:
+        print("\n".join(lines), file=out)
+
 
+def print_separator(char: str = "═", width: int = 72, out=None):
+    print(char * width, file=out)
 
-def print_header(title: str, width: int = 72):
-    print()
-    print_separator()
-    print(f"  {title}")
-    print_separator()
 
+def print_header(title: str, width: int = 72, out=None):
+    print(file=out)
+    print_separator(out=out)
+    print(f"  {title}", file=out)
+    print_separator(out=out)
 
-def report_streams(streams: list):
+
+def report_streams(streams: list, out=None):
     """Print waste stream inventory"""
-    print_header("Waste Streams (User Input)")
+    print_header("Waste Streams (User Input)", out=out)
 
     headers = f"{'ID':<12} {'Qty(L)':>8} {'BTU/lb':>8} {'pH':>6} {'F ppm':>8} {'Solid%':>7} {'Salt ppm':>9}"
-    print(f"  {headers}")
-    print(f"  {'─' * len(headers)}")
+    print(f"  {headers}", file=out)
+    print(f"  {'─' * len(headers)}", file=out)
 
-    for s in streams:
-        print(f"  {s.stream_id:<12} {s.quantity_L:>8.1f} {s.btu_per_lb:>8.0f}"
-              f" {s.pH:>6.1f} {s.f_ppm:>8.0f} {s.solid_pct:>7.1f}"
-              f" {s.salt_ppm:>9.0f}")
+    _print_lines([
+        f"  {s.stream_id:<12} {s.quantity_L:>8.1f} {s.btu_per_lb:>8.0f}"
+        f" {s.pH:>6.1f} {s.f_ppm:>8.0f} {s.solid_pct:>7.1f}"
+        f" {s.salt_ppm:>9.0f}"
+        for s in streams
+    ], out)
 
     total_qty = sum(s.quantity_L for s in streams)
-    print(f"\n  Total inventory: {total_qty:,.1f} L | Stream count: {len(streams)}")
+    print(f"\n  Total inventory: {total_qty:,.1f} L | Stream count: {len(streams)}", file=out)
 
 
-def report_config(cfg: SystemConfig):
+def report_config(cfg: SystemConfig, out=None):
     """Print system configuration (tunable parameters)"""
-    print_header("System Configuration (Tunable Parameters)")
-
-    print("  ┌─ Reactor Parameters ─────────────┐")
-    print(f"  │ F_total     = {cfg.F_total:.1f} L/min          │")
-    print(f"  │ P_system    = {cfg.P_system:.0f} kW              │")
-    print(f"  │ BTU_diesel  = {cfg.BTU_diesel:.0f} BTU/lb        │")
-    print(f"  │ η (eff.)    = {cfg.eta:.2f}                  │")
-    print("  └────────────────────────────────────┘")
-
-    print("  ┌─ Boundary Conditions ─────────────┐")
-    print(f"  │ BTU_target  = {cfg.BTU_target:.0f} BTU/lb         │")
-    print(f"  │ Solid_max   = {cfg.solid_max_pct:.0f}%                  │")
-    print(f"  │ pH_range    = {cfg.pH_min:.0f} – {cfg.pH_max:.0f}                │")
-    print(f"  │ Salt_max    = {cfg.salt_max_ppm:.0f} ppm             │")
-    print("  └────────────────────────────────────┘")
-
-    print("  ┌─ Chemical Constants (fitted) ─────┐")
-    print(f"  │ K_F_TO_ACID       = {cfg.K_F_TO_ACID:.4f}          │")
-    print(f"  │ K_PH_TO_BASE      = {cfg.K_PH_TO_BASE:.1f}            │")
-    print(f"  │ K_ACID_TO_NAOH_VOL= {cfg.K_ACID_TO_NAOH_VOL:.2e}      │")
-    print("  └────────────────────────────────────┘")
-
-    print("  ┌─ Unit Costs ─────────────────────┐")
-    print(f"  │ Diesel  = ${cfg.cost_diesel_per_L:.2f}/L              │")
-    print(f"  │ NaOH    = ${cfg.cost_naoh_per_L:.2f}/L              │")
-    print(f"  │ DI Water= ${cfg.cost_water_per_L:.5f}/L           │")
-    print(f"  │ Power   = ${cfg.cost_electricity_per_kWh:.2f}/kWh            │")
-    print(f"  │ Labor   = ${cfg.cost_labor_per_hr:.0f}/hr               │")
-    print("  └────────────────────────────────────┘")
-
-
-def report_baseline(baseline: Schedule):
+    print_header("System Configuration (Tunable Parameters)", out=out)
+
+    print("  ┌─ Reactor Parameters ─────────────┐", file=out)
+    print(f"  │ F_total     = {cfg.F_total:.1f} L/min          │", file=out)
+    print(f"  │ P_system    = {cfg.P_system:.0f} kW              │", file=out)
+    print(f"  │ BTU_diesel  = {cfg.BTU_diesel:.0f} BTU/lb        │", file=out)
+    print(f"  │ η (eff.)    = {cfg.eta:.2f}                  │", file=out)
+    print("  └────────────────────────────────────┘", file=out)
+
+    print("  ┌─ Boundary Conditions ─────────────┐", file=out)
+    print(f"  │ BTU_target  = {cfg.BTU_target:.0f} BTU/lb         │", file=out)
+    print(f"  │ Solid_max   = {cfg.solid_max_pct:.0f}%                  │", file=out)
+    print(f"  │ pH_range    = {cfg.pH_min:.0f} – {cfg.pH_max:.0f}                │", file=out)
+    print(f"  │ Salt_max    = {cfg.salt_max_ppm:.0f} ppm             │", file=out)
+    print("  └────────────────────────────────────┘", file=out)
+
+    print("  ┌─ Chemical Constants (fitted) ─────┐", file=out)
+    print(f"  │ K_F_TO_ACID       = {cfg.K_F_TO_ACID:.4f}          │", file=out)
+    print(f"  │ K_PH_TO_BASE      = {cfg.K_PH_TO_BASE:.1f}            │", file=out)
+    print(f"  │ K_ACID_TO_NAOH_VOL= {cfg.K_ACID_TO_NAOH_VOL:.2e}      │", file=out)
+    print("  └────────────────────────────────────┘", file=out)
+
+    print("  ┌─ Unit Costs ─────────────────────┐", file=out)
+    print(f"  │ Diesel  = ${cfg.cost_diesel_per_L:.2f}/L              │", file=out)
+    print(f"  │ NaOH    = ${cfg.cost_naoh_per_L:.2f}/L              │", file=out)
+    print(f"  │ DI Water= ${cfg.cost_water_per_L:.5f}/L           │", file=out)
+    print(f"  │ Power   = ${cfg.cost_electricity_per_kWh:.2f}/kWh            │", file=out)
+    print(f"  │ Labor   = ${cfg.cost_labor_per_hr:.0f}/hr               │", file=out)
+    print("  └────────────────────────────────────┘", file=out)
+
+
+def report_baseline(baseline: Schedule, out=None):
     """Print baseline results"""
-    print_header("BASELINE — Solo Processing (No Blending)")
+    print_header("BASELINE — Solo Processing (No Blending)", out=out)
 
+    lines = []
     for i, phase in enumerate(baseline.phases):
-        sid = list(phase.streams.keys())[0]
-        print(f"\n  Stream: {sid}")
-        print(f"    W = {phase.W:.2f} L/min | Runtime = {_fmt_time(phase.runtime_min)}"
-              f" | r_ext = {phase.r_ext:.3f}")
-        print(f"    r_water={_fmt_rate(phase.r_water)}"
-              f"  r_diesel={_fmt_rate(phase.r_diesel)}"
-              f"  r_naoh={_fmt_rate(phase.r_naoh)}")
-        print(f"    Cost: {_fmt_cost(phase.cost_total)}"
-              f"  (diesel={_fmt_cost(phase.cost_diesel)}"
-              f"  NaOH={_fmt_cost(phase.cost_naoh)}"
-              f"  water={_fmt_cost(phase.cost_water)}"
-              f"  power={_fmt_cost(phase.cost_electricity)}"
-              f"  labor={_fmt_cost(phase.cost_labor)})")
-
-    print(f"\n  ── Baseline Summary ──")
-    print(f"  Total cost:    {_fmt_cost(baseline.total_cost)}")
-    print(f"  Total runtime: {_fmt_time(baseline.total_runtime_min)}")
-
-
-def report_optimized(optimized: Schedule, stats: dict = None):
+        sid = phase.streams[0][0]
+        lines += [
+            f"\n  Stream: {sid}",
+            f"    W = {phase.W:.2f} L/min | Runtime = {_fmt_time(phase.runtime_min)}"
+            f" | r_ext = {phase.r_ext:.3f}",
+            f"    r_water={_fmt_rate(phase.r_water)}"
+            f"  r_diesel={_fmt_rate(phase.r_diesel)}"
+            f"  r_naoh={_fmt_rate(phase.r_naoh)}",
+            f"    Cost: {_fmt_cost(phase.cost_total)}"
+            f"  (diesel={_fmt_cost(phase.cost_diesel)}"
+            f"  NaOH={_fmt_cost(phase.cost_naoh)}"
+            f"  water={_fmt_cost(phase.cost_water)}"
+            f"  power={_fmt_cost(phase.cost_electricity)}"
+            f"  labor={_fmt_cost(phase.cost_labor)})",
+        ]
+    _print_lines(lines, out)
+
+    print(f"\n  ── Baseline Summary ──", file=out)
+    print(f"  Total cost:    {_fmt_cost(baseline.total_cost)}", file=out)
+    print(f"  Total runtime: {_fmt_time(baseline.total_runtime_min)}", file=out)
+
+
+def report_optimized(optimized: Schedule, stats: dict = None, out=None):
     """Print optimized results"""
-    print_header("OPTIMIZED — Optimal Feed Plan")
+    print_header("OPTIMIZED — Optimal Feed Plan", out=out)
 
     if optimized is None:
-        print("  ⚠ No feasible solution found")
+        print("  ⚠ No feasible solution found", file=out)
         return
 
+    lines = []
     for i, phase in enumerate(optimized.phases):
         ratio_str = " : ".join(
-            f"{sid}={r}" for sid, r in phase.streams.items()
+            f"{sid}={r}" for sid, r in phase.streams
         )
-        print(f"\n  Phase {i + 1}: [{ratio_str}]")
-        print(f"    Blend props: BTU={phase.blend_props.btu_per_lb:.0f}"
-              f"  pH={phase.blend_props.pH:.1f}"
-              f"  F={phase.blend_props.f_ppm:.0f}ppm"
-              f"  Solid={phase.blend_props.solid_pct:.1f}%"
-              f"  Salt={phase.blend_props.salt_ppm:.0f}ppm")
-        print(f"    W = {phase.W:.2f} L/min | Runtime = {_fmt_time(phase.runtime_min)}"
-              f" | Q = {phase.Q_phase:.1f} L")
-        print(f"    r_water={_fmt_rate(phase.r_water)}"
-              f"  r_diesel={_fmt_rate(phase.r_diesel)}"
-              f"  r_naoh={_fmt_rate(phase.r_naoh)}")
-        print(f"    Cost: {_fmt_cost(phase.cost_total)}"
-              f"  (diesel={_fmt_cost(phase.cost_diesel)}"
-              f"  NaOH={_fmt_cost(phase.cost_naoh)}"
-              f"  water={_fmt_cost(phase.cost_water)}"
-              f"  power={_fmt_cost(phase.cost_electricity)}"
-              f"  labor={_fmt_cost(phase.cost_labor)})")
-
-    print(f"\n  ── Optimization Summary ──")
-    print(f"  Total cost:    {_fmt_cost(optimized.total_cost)}")
-    print(f"  Total runtime: {_fmt_time(optimized.total_runtime_min)}")
+        lines += [
+            f"\n  Phase {i + 1}: [{ratio_str}]",
+            f"    Blend props: BTU={phase.blend_props.btu_per_lb:.0f}"
+            f"  pH={phase.blend_props.pH:.1f}"
+            f"  F={phase.blend_props.f_ppm:.0f}ppm"
+            f"  Solid={phase.blend_props.solid_pct:.1f}%"
+            f"  Salt={phase.blend_props.salt_ppm:.0f}ppm",
+            f"    W = {phase.W:.2f} L/min | Runtime = {_fmt_time(phase.runtime_min)}"
+            f" | Q = {phase.Q_phase:.1f} L",
+            f"    r_water={_fmt_rate(phase.r_water)}"
+            f"  r_diesel={_fmt_rate(phase.r_diesel)}"
+            f"  r_naoh={_fmt_rate(phase.r_naoh)}",
+            f"    Cost: {_fmt_cost(phase.cost_total)}"
+            f"  (diesel={_fmt_cost(phase.cost_diesel)}"
+            f"  NaOH={_fmt_cost(phase.cost_naoh)}"
+            f"  water={_fmt_cost(phase.cost_water)}"
+            f"  power={_fmt_cost(phase.cost_electricity)}"
+            f"  labor={_fmt_cost(phase.cost_labor)})",
+        ]
+    _print_lines(lines, out)
+
+    print(f"\n  ── Optimization Summary ──", file=out)
+    print(f"  Total cost:    {_fmt_cost(optimized.total_cost)}", file=out)
+    print(f"  Total runtime: {_fmt_time(optimized.total_runtime_min)}", file=out)
 
     if stats:
         print(f"\n  Search stats: evaluated={stats['evaluated']:,}"
               f"  infeasible_pruned={stats['pruned_infeasible']:,}"
               f"  templates_kept={stats.get('templates_kept', 'N/A')}"
               f"  cost_pruned={stats['pruned_bound']:,}"
-              f"  memo_hits={stats['memo_hits']:,}")
+              f"  memo_hits={stats['memo_hits']:,}", file=out)
+
+
+def _cost_sums(phases: list) -> tuple:
+    """Per-component cost totals in one pass: (diesel, naoh, water, elec, labor)"""
+    diesel = naoh = water = elec = labor = 0.0
+    for p in phases:
+        diesel += p.cost_diesel
+        naoh += p.cost_naoh
+        water += p.cost_water
+        elec += p.cost_electricity
+        labor += p.cost_labor
+    return diesel, naoh, water, elec, labor
 
 
-def report_comparison(baseline: Schedule, optimized: Schedule):
+def report_comparison(baseline: Schedule, optimized: Schedule, out=None):
     """Print Baseline vs Optimized comparison"""
-    print_header("Cost Comparison — Baseline vs Optimized")
+    print_header("Cost Comparison — Baseline vs Optimized", out=out)
 
     if optimized is None:
-        print("  Cannot compare: optimization found no feasible solution")
+        print("  Cannot compare: optimization found no feasible solution", file=out)
         return
 
     # Aggregate cost comparison
-    b_diesel = sum(p.cost_diesel for p in baseline.phases)
-    b_naoh = sum(p.cost_naoh for p in baseline.phases)
-    b_water = sum(p.cost_water for p in baseline.phases)
-    b_elec = sum(p.cost_electricity for p in baseline.phases)
-    b_labor = sum(p.cost_labor for p in baseline.phases)
-
-    o_diesel = sum(p.cost_diesel for p in optimized.phases)
-    o_naoh = sum(p.cost_naoh for p in optimized.phases)
-    o_water = sum(p.cost_water for p in optimized.phases)
-    o_elec = sum(p.cost_electricity for p in optimized.phases)
-    o_labor = sum(p.cost_labor for p in optimized.phases)
+    b_diesel, b_naoh, b_water, b_elec, b_labor = _cost_sums(baseline.phases)
+    o_diesel, o_naoh, o_water, o_elec, o_labor = _cost_sums(optimized.phases)
 
     items = [
         ("Diesel", b_diesel, o_diesel),
@@ -192,68 +221,87 @@ def report_comparison(baseline: Schedule, optimized: Schedule):
     ]
 
     header = f"  {'Item':<10} {'Baseline':>14} {'Optimized':>14} {'Savings':>10}"
-    print(header)
-    print(f"  {'─' * 50}")
+    print(header, file=out)
+    print(f"  {'─' * 50}", file=out)
 
-    for name, bval, oval in items:
-        print(f"  {name:<10} {_fmt_cost(bval):>14} {_fmt_cost(oval):>14}"
-              f" {_pct_change(bval, oval):>10}")
+    _print_lines([
+        f"  {name:<10} {_fmt_cost(bval):>14} {_fmt_cost(oval):>14}"
+        f" {_pct_change(bval, oval):>10}"
+        for name, bval, oval in items
+    ], out)
 
     # Runtime comparison
     print(f"\n  Runtime:    {_fmt_time(baseline.total_runtime_min):>14}"
           f" {_fmt_time(optimized.total_runtime_min):>14}"
-          f" {_pct_change(baseline.total_runtime_min, optimized.total_runtime_min):>10}")
+          f" {_pct_change(baseline.total_runtime_min, optimized.total_runtime_min):>10}", file=out)
 
     # Total savings
     savings = baseline.total_cost - optimized.total_cost
     savings_pct = savings / baseline.total_cost * 100 if baseline.total_cost > 0 else 0
-    print(f"\n  Total savings: {_fmt_cost(savings)} ({savings_pct:.1f}%)")
+    print(f"\n  Total savings: {_fmt_cost(savings)} ({savings_pct:.1f}%)", file=out)
 
 
-def report_safety(optimized: Schedule, cfg: SystemConfig):
+def report_safety(optimized: Schedule, cfg: SystemConfig, out=None):
     """Print safety boundary report"""
-    print_header("Safety Report — Properties vs Boundaries")
+    print_header("Safety Report — Properties vs Boundaries", out=out)
 
     if optimized is None:
-        print("  No optimization results")
+        print("  No optimization results", file=out)
         return
 
+    lines = []
     for i, phase in enumerate(optimized.phases):
         b = phase.blend_props
-        # Effective values after water addition
-        effective_solid = b.solid_pct / (1.0 + phase.r_water) if phase.r_water > 0 else b.solid_pct
-        effective_salt = b.salt_ppm / (1.0 + phase.r_water) if phase.r_water > 0 else b.salt_ppm
-        BTU_eff = b.btu_per_lb / (1.0 + phase.r_water)
-
-        ratio_str = ":".join(str(r) for r in phase.streams.values())
-        print(f"\n  Phase {i + 1} [{ratio_str}]")
-        print(f"    BTU_eff   = {BTU_eff:>8.0f}  (target: {cfg.BTU_target:.0f})"
-              f"  {'✓ OK' if BTU_eff + phase.r_diesel * cfg.BTU_diesel * cfg.eta >= cfg.BTU_target else '⚠'}")
-        print(f"    Solid_eff = {effective_solid:>8.1f}%  (max: {cfg.solid_max_pct:.0f}%)"
-              f"  {'✓ OK' if effective_solid <= cfg.solid_max_pct else '⚠ OVER'}")
-        print(f"    Salt_eff  = {effective_salt:>8.0f}  (max: {cfg.salt_max_ppm:.0f})"
-              f"  {'✓ OK' if effective_salt <= cfg.salt_max_ppm else '⚠ OVER'}")
-        print(f"    W         = {phase.W:>8.2f}  (min: {cfg.W_min:.1f})"
-              f"  {'✓ OK' if phase.W >= cfg.W_min else '⚠ LOW'}")
+        # Effective values after water addition (r_water = 0 → dilution
+        # 1.0, which divides exactly, so no special case is needed)
+        dilution = 1.0 + phase.r_water
+        effective_solid = b.solid_pct / dilution
+        effective_salt = b.salt_ppm / dilution
+        BTU_eff = b.btu_per_lb / dilution
+
+        ratio_str = ":".join(str(r) for _, r in phase.streams)
+        lines += [
+            f"\n  Phase {i + 1} [{ratio_str}]",
+            f"    BTU_eff   = {BTU_eff:>8.0f}  (target: {cfg.BTU_target:.0f})"
+            f"  {'✓ OK' if BTU_eff + phase.r_diesel * cfg.BTU_diesel * cfg.eta >= cfg.BTU_target else '⚠'}",
+            f"    Solid_eff = {effective_solid:>8.1f}%  (max: {cfg.solid_max_pct:.0f}%)"
+            f"  {'✓ OK' if effective_solid <= cfg.solid_max_pct else '⚠ OVER'}",
+            f"    Salt_eff  = {effective_salt:>8.0f}  (max: {cfg.salt_max_ppm:.0f})"
+            f"  {'✓ OK' if effective_salt <= cfg.salt_max_ppm else '⚠ OVER'}",
+            f"    W         = {phase.W:>8.2f}  (min: {cfg.W_min:.1f})"
+            f"  {'✓ OK' if phase.W >= cfg.W_min else '⚠ LOW'}",
+        ]
+    _print_lines(lines, out)
+
+
+def format_report(streams: list, cfg: SystemConfig,
+                  baseline: Schedule, optimized: Schedule,
+                  stats: dict = None) -> str:
+    """Full report as one string (sections rendered into a StringIO)"""
+    out = io.StringIO()
+    print("\n" + "▓" * 72, file=out)
+    print("  AxNano Smart-Feed Algorithm v9 — Optimization Report", file=out)
+    print("▓" * 72, file=out)
+
+    report_streams(streams, out=out)
+    report_config(cfg, out=out)
+    report_baseline(baseline, out=out)
+    report_optimized(optimized, stats, out=out)
+    report_comparison(baseline, optimized, out=out)
+    report_safety(optimized, cfg, out=out)
+
+    print(file=out)
+    print_separator(out=out)
+    print("  Report complete", file=out)
+    print_separator(out=out)
+    print(file=out)
+    return out.getvalue()
 
 
 def full_report(streams: list, cfg: SystemConfig,
                 baseline: Schedule, optimized: Schedule,
-                stats: dict = None):
-    """Full report"""
-    print("\n" + "▓" * 72)
-    print("  AxNano Smart-Feed Algorithm v9 — Optimization Report")
-    print("▓" * 72)
-
-    report_streams(streams)
-    report_config(cfg)
-    report_baseline(baseline)
-    report_optimized(optimized, stats)
-    report_comparison(baseline, optimized)
-    report_safety(optimized, cfg)
-
-    print()
-    print_separator()
-    print("  Report complete")
-    print_separator()
-    print()
+                stats: dict = None, out=None):
+    """Full report — built in memory, written to out (stdout) in one call"""
+    if out is None:
+        out = sys.stdout
+    out.write(format_report(streams, cfg, baseline, optimized, stats))
@@ -10,6 +10,13 @@ Search strategy:
   Bound 3: depth ≤ N (max N phases for N streams)
   Prune 1: W < W_min or pH > pH_max → filtered once during pre-computation
   Prune 2: phase.cost ≥ best_sub_cost → local B&B pruning (break after sort)
+  Prune 3: phase.cost + LB(remaining) ≥ best_sub_cost → skip candidate
+           (LB: remaining volume at W ≤ F_total pays ≥ power + labor)
+           OFF by default (_LOWER_BOUND_PRUNE): with the liter-rounded
+           memo, a skipped subtree never claims its memo keys, so later
+           branches reach them from other states and can settle on a
+           costlier plan than the unpruned search — even though the
+           bound itself never cuts a better candidate.
   Memo:    cache sub-problem optimal solutions (return value is sub-problem
            cost, independent of external context)
 
@@ -20,34 +27,74 @@ P0 fix notes:
 
 Performance optimizations:
   1. Pre-evaluation: all (subset, ratios) blend properties and Gatekeeper results
-     are inventory-independent, evaluated once. Infeasible combos filtered here.
+     are inventory-independent, evaluated once — one vectorized NumPy batch
+     per subset. Infeasible combos filtered here.
   2. Template quota: keep only the K lowest cost_per_batch templates per subset,
      greatly reducing branching factor (5 streams: ~4000 → ~785).
   3. Cost rate budget: pre-compute cost_per_batch per template; during search,
-     only num_batches × cost_per_batch needed for phase cost.
+     only num_batches × cost_per_batch needed for phase cost — computed for
+     all templates at once as array ops over a flat (T, N) ratio table.
   4. Sorted exploration: candidates sorted by cost ascending at each search node,
      cheapest first → B&B tightens faster, can break on first exceed.
-  5. Integer memo: round(qty, 0) rounds inventory to nearest liter,
+  5. Integer memo: round(qty) rounds inventory to nearest liter,
      greatly reducing unique states; negligible impact for 100L+ inventories.
+     Key packs the int liters of each stream, in stream-id order, into a
+     single int (one cheap hash instead of a tuple's).
+  6. Compiled search: with Numba installed and ≥ _COMPILED_MIN_STREAMS
+     streams, the recursion below runs as _search_kernel.run_search on
+     the flat template table — same float operations in the same order,
+     so identical plans and stats (while
+     the inventory fits its two-word memo key: ≤ 6 streams of < ~2
+     million L each; otherwise the Python recursion runs).
+
+Parallelism (deliberately none):
+  Pre-evaluation is a handful of NumPy batches (≤ 462 ratios per subset at
+  ratio_sum_max = 11), too small for threads or prange to pay off. The
+  recursion shares the memo and B&B bounds across branches, and because
+  the memo merges states to the liter, the value cached for a key depends
+  on which branch reached it first — splitting branches across workers
+  would make the plan depend on scheduling.
 """
 
 from itertools import combinations
 from dataclasses import dataclass
+from importlib.util import find_spec
 from .models import WasteStream, SystemConfig, PhaseResult, Schedule, BlendProperties
-from .ratios import generate_ratios
-from .gatekeeper import gatekeeper, calc_throughput, calc_phase_cost
-from .blending import calc_blend_properties
+import numpy as np
+
+from .ratios import generate_ratio_array
+from .gatekeeper import evaluate_phases_batch, calc_phase_cost
+from .blending import stream_matrix, prepare_blend_matrix
+
+# Numba is optional and only needed by the compiled search (_search_kernel);
+# probe for it without importing it — the import alone costs a few hundred
+# ms, which small searches should not pay.
+HAVE_NUMBA = find_spec("numba") is not None
+
+# Compiled recursion (_search_kernel) when Numba is available, else the
+# NumPy-vectorized Python recursion below — same plans either way
+_COMPILED_SEARCH = HAVE_NUMBA
+# ...but only from this many streams up: importing Numba and loading the
+# cached kernel take ~0.4 s (and the first compile ~7 s), while the
+# Python recursion finishes 3 streams in ~0.01 s. Numba is imported only
+# when a search crosses this threshold.
+_COMPILED_MIN_STREAMS = 4
+
+# PRUNE 3 switch (see module docstring) — off: plans match the unpruned
+# search exactly; on: ~1.5× faster on 5 streams, plan may cost slightly more
+_LOWER_BOUND_PRUNE = False
 
 # MVP search parameters
 _MAX_TEMPLATES_PER_SUBSET = 30  # Max templates kept per subset
 _ACTIVE_THRESHOLD_L = 0.5       # Inventory < 0.5L treated as depleted
+_INF = float("inf")             # Infeasible / not-yet-found cost
 
 
 # ═══════════════════════════════════════════════════════════════
 # Phase Template — inventory-independent pre-computed structure
 # ═══════════════════════════════════════════════════════════════
 
-@dataclass
+@dataclass(slots=True)
 class _PhaseTemplate:
     """
     Pre-evaluated phase template — inventory-independent portion.
@@ -90,75 +137,126 @@ def _precompute_templates(streams, cfg, ratio_cache):
 
     Returns:
         (templates_by_subset, n_total, n_infeasible, n_feasible)
+        templates_by_subset: sorted stream-id tuple → kept templates
     """
     streams_map = {s.stream_id: s for s in streams}
     all_ids = sorted(streams_map.keys())
+    # Blend-ready SoA matrix ([H⁺] precomputed), built once; rows follow all_ids
+    prepared = prepare_blend_matrix(
+        stream_matrix([streams_map[sid] for sid in all_ids]))
     templates_by_subset = {}
     n_total = 0
     n_infeasible = 0
     n_feasible = 0
 
-    # Pre-compute fixed overhead rate ($/min): electricity + labor
-    fixed_cost_per_min = (
-        cfg.P_system * cfg.cost_electricity_per_kWh + cfg.cost_labor_per_hr
-    ) / 60.0
-
     for subset_size in range(1, len(all_ids) + 1):
-        for subset in combinations(all_ids, subset_size):
-            subset_streams = [streams_map[sid] for sid in subset]
-            ratios_list = ratio_cache.get(len(subset), [(1,)])
-
-            templates = []
-            for ratios in ratios_list:
-                n_total += 1
-                blend = calc_blend_properties(subset_streams, ratios)
-
-                # Prune 1a: pH upper bound check
-                if blend.pH > cfg.pH_max:
-                    n_infeasible += 1
-                    continue
-
-                r_water, r_diesel, r_naoh = gatekeeper(blend, cfg)
-                W = calc_throughput(r_water, r_diesel, r_naoh, cfg)
-
-                # Prune 1b: throughput too low
-                if W < cfg.W_min:
-                    n_infeasible += 1
-                    continue
-
-                # Pre-compute cost_per_batch
-                sum_ratios = sum(ratios)
-                material_cost_per_min = W * (
-                    r_diesel * cfg.cost_diesel_per_L
-                    + r_naoh * cfg.cost_naoh_per_L
-                    + r_water * cfg.cost_water_per_L
-                )
-                cost_rate_per_min = material_cost_per_min + fixed_cost_per_min
-                cost_per_batch = sum_ratios / W * cost_rate_per_min
-
-                templates.append(_PhaseTemplate(
+        ratios_arr = ratio_cache[subset_size]
+        ratios_list = ratios_arr.tolist()
+        for subset_rows in combinations(range(len(all_ids)), subset_size):
+            subset = tuple(all_ids[i] for i in subset_rows)
+
+            # All ratios of this subset evaluated as one vectorized batch
+            batch = evaluate_phases_batch(prepared[list(subset_rows)],
+                                          ratios_arr, cfg)
+            n_total += len(ratios_list)
+
+            # Prune 1: pH > pH_max or W < W_min
+            feasible_idx = np.flatnonzero(batch["feasible"])
+            n_infeasible += len(ratios_list) - len(feasible_idx)
+            if len(feasible_idx) == 0:
+                continue
+
+            # Sort by cost_per_batch, keep only the K most economical
+            # (stable sort: ties keep ratio enumeration order)
+            cost_per_batch = batch["cost_per_batch"]
+            order = np.argsort(cost_per_batch[feasible_idx], kind="stable")
+            kept_idx = feasible_idx[order][:_MAX_TEMPLATES_PER_SUBSET]
+
+            # Only kept rows leave the arrays as Python objects
+            blends = batch["blend"][kept_idx].tolist()
+            cols = {key: batch[key][kept_idx].tolist() for key in (
+                "r_water", "r_diesel", "r_naoh", "W", "cost_per_batch",
+            )}
+            kept = []
+            for k, i in enumerate(kept_idx.tolist()):
+                ratios = tuple(ratios_list[i])
+                r_water = cols["r_water"][k]
+                r_diesel = cols["r_diesel"][k]
+                r_naoh = cols["r_naoh"][k]
+                kept.append(_PhaseTemplate(
                     stream_ids=subset,
                     ratios=ratios,
-                    blend=blend,
+                    blend=BlendProperties(*blends[k]),
                     r_water=r_water,
                     r_diesel=r_diesel,
                     r_naoh=r_naoh,
                     r_ext=r_water + r_diesel + r_naoh,
-                    W=W,
-                    cost_per_batch=cost_per_batch,
-                    sum_ratios=sum_ratios,
+                    W=cols["W"][k],
+                    cost_per_batch=cols["cost_per_batch"][k],
+                    sum_ratios=sum(ratios),
                 ))
 
-            if templates:
-                # Sort by cost_per_batch, keep only the K most economical
-                templates.sort(key=lambda t: t.cost_per_batch)
-                kept = templates[:_MAX_TEMPLATES_PER_SUBSET]
-                templates_by_subset[frozenset(subset)] = kept
-                n_feasible += len(kept)
+            templates_by_subset[subset] = kept
+            n_feasible += len(kept)
 
     return templates_by_subset, n_total, n_infeasible, n_feasible
 
 
+def _template_table(all_templates: dict, all_ids: list) -> tuple:
+    """
+    Flatten templates into arrays for vectorized candidate collection.
+
+    Rows follow all_templates iteration order (the order the scalar loop
+    visited them), columns follow all_ids.
+
+    Returns:
+        (flat_templates, ratios (T, N) float64 with 0 for streams not in
+         the template, uses (T, N) bool, cost_per_batch (T,))
+    """
+    col = {sid: j for j, sid in enumerate(all_ids)}
+    flat_templates = [t for ts in all_templates.values() for t in ts]
+    ratios = np.zeros((len(flat_templates), len(all_ids)))
+    for i, tmpl in enumerate(flat_templates):
+        for sid, ratio in zip(tmpl.stream_ids, tmpl.ratios):
+            ratios[i, col[sid]] = ratio
+    cost_per_batch = np.array([t.cost_per_batch for t in flat_templates],
+                              dtype=np.float64)
+    return flat_templates, ratios, ratios > 0, cost_per_batch
+
+
+def _build_phase(tmpl: _PhaseTemplate, num_batches: float,
+                 cfg: SystemConfig) -> PhaseResult:
+    """
+    Materialize a PhaseResult from a template and its batch count.
+
+    Deferred until the final plan is known — candidates are compared on
+    num_batches × cost_per_batch alone, and memo entries store only the
+    template row and batch count.
+    """
+    Q_phase = tmpl.sum_ratios * num_batches
+    runtime_min = Q_phase / tmpl.W
+    costs = calc_phase_cost(
+        Q_phase, tmpl.r_water, tmpl.r_diesel, tmpl.r_naoh, runtime_min, cfg
+    )
+    return PhaseResult(
+        streams=tuple(zip(tmpl.stream_ids, tmpl.ratios)),
+        blend_props=tmpl.blend,
+        r_water=tmpl.r_water,
+        r_diesel=tmpl.r_diesel,
+        r_naoh=tmpl.r_naoh,
+        r_ext=tmpl.r_ext,
+        W=tmpl.W,
+        runtime_min=runtime_min,
+        Q_phase=Q_phase,
+        cost_diesel=costs.diesel,
+        cost_naoh=costs.naoh,
+        cost_water=costs.water,
+        cost_electricity=costs.electricity,
+        cost_labor=costs.labor,
+        cost_total=costs.total,
+    )
+
+
 # ═══════════════════════════════════════════════════════════════
 # Search main function
 # ═══════════════════════════════════════════════════════════════
@@ -181,18 +279,29 @@ def search(
     inventory = {s.stream_id: s.quantity_L for s in streams}
     N = len(streams)
 
-    # Pre-generate ratios for each subset size
+    # Pre-generate ratios for each subset size (int arrays, one row per ratio)
     ratio_cache = {}
     for n in range(1, N + 1):
-        ratio_cache[n] = generate_ratios(n, cfg.ratio_sum_max)
+        ratio_cache[n] = generate_ratio_array(n, cfg.ratio_sum_max)
 
     # Pre-evaluate all feasible phase templates
     all_templates, n_total, n_infeasible, n_feasible = _precompute_templates(
         streams, cfg, ratio_cache
     )
 
-    # Memoization cache: memo_key → (sub_cost, phases)
-    memo = {}
+    all_ids = sorted(streams_map)
+    flat_templates, tmpl_ratios, tmpl_uses, tmpl_cost_per_batch = (
+        _template_table(all_templates, all_ids))
+
+    tmpl_sum_ratios = tmpl_ratios.sum(axis=1)
+
+    # Lower bound on any sub-problem's cost, per liter still to process:
+    # W ≤ F_total, so runtime ≥ V / F_total, and power + labor accrue at a
+    # fixed $/min regardless of the blend. 0 when PRUNE 3 is off — the
+    # check then never fires (PRUNE 2 already broke on cost ≥ best).
+    lb_cost_per_L = (
+        cfg.P_system * cfg.cost_electricity_per_kWh + cfg.cost_labor_per_hr
+    ) / 60.0 / cfg.F_total if _LOWER_BOUND_PRUNE else 0.0
 
     # Search statistics
     stats = {
@@ -203,110 +312,181 @@ def search(
         "memo_hits": 0,
     }
 
-    def _search(inv: dict, depth: int) -> tuple:
+    # Widest rounded quantity — inventory only shrinks, so every memo key
+    # component fits in key_bits
+    max_key_L = round(max(inventory.values()))
+    key_bits = max(1, max_key_L.bit_length())
+
+    compiled = _COMPILED_SEARCH and N >= _COMPILED_MIN_STREAMS
+    if compiled:
+        from ._search_kernel import run_search, MAX_KEY_L, MAX_KEY_STREAMS
+        compiled = N <= MAX_KEY_STREAMS and max_key_L <= MAX_KEY_L
+
+    if compiled:
+        best_cost, plan_rows, plan_batches, pruned_bound, memo_hits = (
+            run_search(
+                np.array([inventory[sid] for sid in all_ids], dtype=np.float64),
+                tmpl_ratios, tmpl_uses, tmpl_cost_per_batch,
+                tmpl_sum_ratios, lb_cost_per_L,
+            ))
+        stats["pruned_bound"] = int(pruned_bound)
+        stats["memo_hits"] = int(memo_hits)
+        best_phases = [
+            _build_phase(flat_templates[t], nb, cfg)
+            for t, nb in zip(plan_rows.tolist(), plan_batches.tolist())
+        ]
+        return best_cost, best_phases, stats
+
+    # Python recursion works on columns: inventory is a list in all_ids
+    # order, each template lists its (column, ratio) pairs
+    col = {sid: j for j, sid in enumerate(all_ids)}
+    tmpl_cols = [tuple((col[sid], ratio)
+                       for sid, ratio in zip(t.stream_ids, t.ratios))
+                 for t in flat_templates]
+
+    # Memoization cache: memo_key → (sub_cost, template row, num_batches,
+    # child memo_key) — phases are built only for the final plan
+    memo = {}
+    # Active-stream set (is_active bytes) → (usable template rows,
+    # their ratio rows, their cost_per_batch)
+    usable_cache = {}
+    threshold = _ACTIVE_THRESHOLD_L  # closure cell, read per stream per call
+
+    def _search(inv: list, depth: int) -> tuple:
         """
         Recursive core — returns sub-problem cost.
 
         Args:
-            inv: Current inventory {stream_id: remaining_L}
+            inv: Current inventory, remaining_L per all_ids column — one
+                 list shared by the whole recursion, mutated and restored
             depth: Current recursion depth
 
         Returns:
-            (sub_cost, phases_list)
+            (sub_cost, memo_key)
             sub_cost: Min cost from current inventory to depletion
+            memo_key: This node's key, so the caller can link its
+                      winning child into the plan chain
         """
-        # Get streams that still have inventory (< 0.5L treated as depleted,
-        # eliminates floating-point residuals)
-        active = {sid: qty for sid, qty in inv.items()
-                  if qty > _ACTIVE_THRESHOLD_L}
+        # Memoization: integer precision merges nearby states
+        # For 100L+ inventories, <0.5L rounding error is negligible
+        # Key: int liters per stream in all_ids order (round() is
+        # half-to-even, as round(qty, 0) was), packed key_bits per stream
+        # into one int; depleted streams (< 0.5L, eliminates floating-point
+        # residuals) are 0, active ones round to ≥ 1 — so key 0 means
+        # all inventory depleted
+        memo_key = 0
+        for q in inv:
+            memo_key = (memo_key << key_bits) | (
+                round(q) if q > threshold else 0)
 
         # Terminal: all inventory depleted
-        if not active:
-            return 0.0, []
+        if not memo_key:
+            return 0.0, 0
 
         # BOUND 3: max phase count = total number of streams
         if depth > N:
-            return float("inf"), []
+            return _INF, memo_key
 
-        # Memoization: integer precision merges nearby states
-        # For 100L+ inventories, <0.5L rounding error is negligible
-        memo_key = frozenset(
-            (sid, round(qty, 0)) for sid, qty in sorted(active.items())
-        )
         if memo_key in memo:
             stats["memo_hits"] += 1
-            return memo[memo_key]
-
-        active_ids_set = frozenset(active.keys())
-
-        # ── Collect candidate phases: (cost, template, num_batches) ──
-        # Cost only needs num_batches × cost_per_batch (one min + one multiply)
-        candidates = []
-        for subset_key, templates in all_templates.items():
-            if not subset_key.issubset(active_ids_set):
-                continue
-            for tmpl in templates:
-                num_batches = min(
-                    active[sid] / ratio
-                    for sid, ratio in zip(tmpl.stream_ids, tmpl.ratios)
-                )
-                cost = num_batches * tmpl.cost_per_batch
-                candidates.append((cost, tmpl, num_batches))
+            return memo[memo_key][0], memo_key
+
+        # This node's quantities, restored after each candidate — copied
+        # only for nodes that get expanded (most calls end at the memo
+        # check above)
+        node_qty = inv[:]
+
+        qty = np.array(node_qty, dtype=np.float64)
+        is_active = qty > threshold
+
+        # ── Collect candidate phases over the usable templates at once ──
+        # Usable rows (all streams active) depend only on the active set,
+        # so they are sliced once per set and reused by every node with it.
+        active_key = is_active.tobytes()
+        usable_rows = usable_cache.get(active_key)
+        if usable_rows is None:
+            usable = np.flatnonzero(~tmpl_uses[:, ~is_active].any(axis=1))
+            usable_rows = usable_cache[active_key] = (
+                usable, tmpl_ratios[usable], tmpl_cost_per_batch[usable],
+                tmpl_sum_ratios[usable])
+        (usable, usable_ratios, usable_cost_per_batch,
+         usable_sum_ratios) = usable_rows
+
+        # num_batches = min(qty / ratio) over the template's streams; columns
+        # with ratio 0 divide to +inf (depleted streams set to 1.0 so that
+        # never yields nan/-inf). Cost = num_batches × cost_per_batch.
+        with np.errstate(divide="ignore"):
+            per_stream = np.where(is_active, qty, 1.0) / usable_ratios
+        batches_arr = per_stream.min(axis=1)
+        cost_arr = batches_arr * usable_cost_per_batch
+
+        # PRUNE 3 bound per candidate: phase cost + LB(remaining) — every
+        # liter above the depletion threshold still has to pass the reactor.
+        # excess_L - Q_phase never exceeds the true remaining excess.
+        # (Summed in all_ids order, as the compiled kernel does.)
+        if lb_cost_per_L:
+            excess_L = sum(q for q in node_qty if q > threshold)
+            excess_L -= threshold * int(is_active.sum())
+            remaining_L = excess_L - usable_sum_ratios * batches_arr
+            bound_arr = cost_arr + remaining_L * lb_cost_per_L
+        else:
+            bound_arr = cost_arr
 
         # ── Sort by cost ascending — explore cheapest first ──
-        candidates.sort(key=lambda x: x[0])
-
-        best_sub_cost = float("inf")
-        best_phases = None
-
-        for i, (cost_total, tmpl, num_batches) in enumerate(candidates):
+        # (stable: ties keep template order, as list.sort did)
+        # Not by bound: the liter-rounded memo keeps whichever state reached
+        # a key first, so visiting order changes the plan returned.
+        order = np.argsort(cost_arr, kind="stable")
+        candidates = list(zip(cost_arr[order].tolist(),
+                              bound_arr[order].tolist(),
+                              usable[order].tolist(),
+                              batches_arr[order].tolist()))
+
+        best_sub_cost = _INF
+        best_choice = (-1, 0.0, 0)  # (template row, num_batches, child key)
+
+        for i, (cost_total, bound, t_idx, num_batches) in enumerate(candidates):
             # PRUNE 2: local B&B — after sorting, first exceed means break
             # All subsequent costs are higher, total_from_here ≥ cost_total ≥ best_sub_cost
             if cost_total >= best_sub_cost:
                 stats["pruned_bound"] += len(candidates) - i
                 break
 
-            # Update inventory
-            new_inv = dict(inv)
-            for sid, ratio in zip(tmpl.stream_ids, tmpl.ratios):
-                new_inv[sid] = active[sid] - ratio * num_batches
+            # PRUNE 3: lower bound on the remaining sub-problem
+            if bound >= best_sub_cost:
+                stats["pruned_bound"] += 1
+                continue
+            cols = tmpl_cols[t_idx]
+
+            # Apply the phase to the shared inventory (no per-branch copy)
+            for j, ratio in cols:
+                inv[j] = node_qty[j] - ratio * num_batches
 
             # Recurse: get optimal cost for remaining inventory
-            remaining_cost, remaining_phases = _search(new_inv, depth + 1)
+            remaining_cost, child_key = _search(inv, depth + 1)
+
+            # Undo: restore this node's quantities before the next candidate
+            for j, _ in cols:
+                inv[j] = node_qty[j]
 
             total_from_here = cost_total + remaining_cost
             if total_from_here < best_sub_cost:
                 best_sub_cost = total_from_here
-                # Deferred PhaseResult construction — only when a better solution is found
-                Q_phase = tmpl.sum_ratios * num_batches
-                runtime_min = Q_phase / tmpl.W
-                costs = calc_phase_cost(
-                    tmpl.W, tmpl.r_water, tmpl.r_diesel, tmpl.r_naoh,
-                    runtime_min, cfg
-                )
-                phase = PhaseResult(
-                    streams=dict(zip(tmpl.stream_ids, tmpl.ratios)),
-                    blend_props=tmpl.blend,
-                    r_water=tmpl.r_water,
-                    r_diesel=tmpl.r_diesel,
-                    r_naoh=tmpl.r_naoh,
-                    r_ext=tmpl.r_ext,
-                    W=tmpl.W,
-                    runtime_min=runtime_min,
-                    Q_phase=Q_phase,
-                    **costs,
-                )
-                best_phases = [phase] + remaining_phases
-
-        # Cache sub-problem optimal solution
-        if best_phases is not None:
-            memo[memo_key] = (best_sub_cost, list(best_phases))
-        else:
-            memo[memo_key] = (float("inf"), [])
+                best_choice = (t_idx, num_batches, child_key)
+
+        # Cache sub-problem optimal solution (inf / no template if none found)
+        memo[memo_key] = (best_sub_cost, *best_choice)
+        return best_sub_cost, memo_key
 
-        return memo[memo_key]
+    best_cost, key = _search([inventory[sid] for sid in all_ids], 0)
 
-    best_cost, best_phases = _search(inventory, 0)
+    # Follow the memo chain from the root (depleted state: no entry); the
+    # PhaseResult is built once per plan phase, not per expanded node
+    best_phases = []
+    while best_cost < _INF and key in memo and len(best_phases) < N + 1:
+        _, t_idx, num_batches, key = memo[key]
+        best_phases.append(_build_phase(flat_templates[t_idx], num_batches,
+                                        cfg))
 
     return best_cost, best_phases, stats
 
@@ -323,7 +503,7 @@ def build_optimized_schedule(
     """
     best_cost, best_phases, stats = search(streams, cfg)
 
-    if best_phases is None or best_cost == float("inf"):
+    if best_phases is None or best_cost == _INF:
         return None, stats
 
     schedule = Schedule(
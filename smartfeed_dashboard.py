@@ -37,7 +37,7 @@ import math
 import time
 import os
 import sys
-from dataclasses import asdict
+from dataclasses import asdict, replace
 
 # ═══════════════════════════════════════════════════════════════
 # IMPORT smart_feed_v9 PACKAGE
@@ -180,7 +180,7 @@ def _phase_timeline(optimized: Schedule):
     # Build horizontal stacked bar per phase row
     phase_labels = []
     for i, ph in enumerate(optimized.phases):
-        parts = " + ".join(f"{sid}×{r}" for sid, r in ph.streams.items())
+        parts = " + ".join(f"{sid}×{r}" for sid, r in ph.streams)
         phase_labels.append(f"Phase {i+1}: {parts}")
     # Reverse for bottom-to-top display
     phase_labels = phase_labels[::-1]
@@ -196,7 +196,7 @@ def _phase_timeline(optimized: Schedule):
         text=[f"{ph.runtime_min:.0f} min · ${ph.cost_total:.0f}" for ph in phases_rev],
         textposition="inside",
         textfont=dict(size=11, color="#FFFFFF", family="JetBrains Mono"),
-        hovertext=[f"Feed: {' + '.join(f'{sid}×{r}' for sid, r in ph.streams.items())}<br>"
+        hovertext=[f"Feed: {' + '.join(f'{sid}×{r}' for sid, r in ph.streams)}<br>"
                    f"Throughput: {ph.W:.2f} L/min<br>"
                    f"Volume: {ph.Q_phase:.1f} L<br>"
                    f"Cost: ${ph.cost_total:.2f}" for ph in phases_rev],
@@ -221,11 +221,10 @@ def _load_json(text: str):
     streams = [WasteStream(**item) for item in data["streams"]]
     return streams, data.get("config", {})
 
-def _apply_overrides(cfg: SystemConfig, overrides: dict):
-    for k, v in overrides.items():
-        if hasattr(cfg, k):
-            setattr(cfg, k, type(getattr(cfg, k))(v))
-    return cfg
+def _apply_overrides(cfg: SystemConfig, overrides: dict) -> SystemConfig:
+    # SystemConfig is frozen — return a replaced copy
+    return replace(cfg, **{k: type(getattr(cfg, k))(v)
+                           for k, v in overrides.items() if hasattr(cfg, k)})
 
 
 # ═══════════════════════════════════════════════════════════════
@@ -323,36 +322,40 @@ code/
     with st.sidebar:
         st.markdown(f'<div class="mono" style="color:{ACCENT};font-size:12px;font-weight:700;letter-spacing:0.12em;text-transform:uppercase;">⚙ SYSTEM CONFIG</div>', unsafe_allow_html=True)
         st.markdown("")
+        edits = {}  # SystemConfig is frozen — collect edits, replace once
 
         with st.expander("Reactor Parameters", expanded=True):
-            cfg.F_total = st.number_input("F_total (L/min)", 1.0, 50.0, cfg.F_total, 0.5)
-            cfg.P_system = st.number_input("P_system (kW)", 100.0, 1000.0, cfg.P_system, 10.0)
-            cfg.BTU_diesel = st.number_input("BTU_diesel (BTU/lb)", 10000.0, 25000.0, cfg.BTU_diesel, 100.0)
-            cfg.eta = st.number_input("η (thermal efficiency)", 0.5, 1.0, cfg.eta, 0.01)
+            edits["F_total"] = st.number_input("F_total (L/min)", 1.0, 50.0, cfg.F_total, 0.5)
+            edits["P_system"] = st.number_input("P_system (kW)", 100.0, 1000.0, cfg.P_system, 10.0)
+            edits["BTU_diesel"] = st.number_input("BTU_diesel (BTU/lb)", 10000.0, 25000.0, cfg.BTU_diesel, 100.0)
+            edits["eta"] = st.number_input("η (thermal efficiency)", 0.5, 1.0, cfg.eta, 0.01)
 
         with st.expander("Boundary Conditions"):
-            cfg.BTU_target = st.number_input("BTU_target (BTU/lb)", 500.0, 10000.0, cfg.BTU_target, 100.0)
-            cfg.solid_max_pct = st.number_input("solid_max_pct (%)", 1.0, 50.0, cfg.solid_max_pct, 0.5)
-            cfg.pH_min = st.number_input("pH_min", 0.0, 7.0, cfg.pH_min, 0.5)
-            cfg.pH_max = st.number_input("pH_max", 7.0, 14.0, cfg.pH_max, 0.5)
-            cfg.salt_max_ppm = st.number_input("salt_max_ppm", 500.0, 50000.0, cfg.salt_max_ppm, 500.0)
+            edits["BTU_target"] = st.number_input("BTU_target (BTU/lb)", 500.0, 10000.0, cfg.BTU_target, 100.0)
+            edits["solid_max_pct"] = st.number_input("solid_max_pct (%)", 1.0, 50.0, cfg.solid_max_pct, 0.5)
+            edits["pH_min"] = st.number_input("pH_min", 0.0, 7.0, cfg.pH_min, 0.5)
+            edits["pH_max"] = st.number_input("pH_max", 7.0, 14.0, cfg.pH_max, 0.5)
+            edits["salt_max_ppm"] = st.number_input("salt_max_ppm", 500.0, 50000.0, cfg.salt_max_ppm, 500.0)
 
         with st.expander("Unit Costs"):
-            cfg.cost_diesel_per_L = st.number_input("Diesel ($/L)", 0.1, 10.0, cfg.cost_diesel_per_L, 0.1)
-            cfg.cost_naoh_per_L = st.number_input("NaOH ($/L)", 0.1, 10.0, cfg.cost_naoh_per_L, 0.01)
-            cfg.cost_water_per_L = st.number_input("DI Water ($/L)", 0.0001, 0.1, cfg.cost_water_per_L, 0.0001, format="%.4f")
-            cfg.cost_electricity_per_kWh = st.number_input("Electricity ($/kWh)", 0.01, 1.0, cfg.cost_electricity_per_kWh, 0.01)
-            cfg.cost_labor_per_hr = st.number_input("Labor ($/hr)", 10.0, 500.0, cfg.cost_labor_per_hr, 10.0)
+            edits["cost_diesel_per_L"] = st.number_input("Diesel ($/L)", 0.1, 10.0, cfg.cost_diesel_per_L, 0.1)
+            edits["cost_naoh_per_L"] = st.number_input("NaOH ($/L)", 0.1, 10.0, cfg.cost_naoh_per_L, 0.01)
+            edits["cost_water_per_L"] = st.number_input("DI Water ($/L)", 0.0001, 0.1, cfg.cost_water_per_L, 0.0001, format="%.4f")
+            edits["cost_electricity_per_kWh"] = st.number_input("Electricity ($/kWh)", 0.01, 1.0, cfg.cost_electricity_per_kWh, 0.01)
+            edits["cost_labor_per_hr"] = st.number_input("Labor ($/hr)", 10.0, 500.0, cfg.cost_labor_per_hr, 10.0)
 
         with st.expander("K-Value Calibration"):
-            cfg.K_F_TO_ACID = st.number_input("K_F_TO_ACID (meq/L·ppm)", 0.01, 0.2, cfg.K_F_TO_ACID, 0.001, format="%.4f")
-            cfg.K_PH_TO_BASE = st.number_input("K_PH_TO_BASE (meq/L·pH)", 5.0, 200.0, cfg.K_PH_TO_BASE, 5.0)
-            cfg.K_ACID_TO_NAOH_VOL = st.number_input("K_ACID_TO_NAOH_VOL (L/meq)", 1e-6, 1e-3, cfg.K_ACID_TO_NAOH_VOL, 1e-6, format="%.2e")
+            edits["K_F_TO_ACID"] = st.number_input("K_F_TO_ACID (meq/L·ppm)", 0.01, 0.2, cfg.K_F_TO_ACID, 0.001, format="%.4f")
+            edits["K_PH_TO_BASE"] = st.number_input("K_PH_TO_BASE (meq/L·pH)", 5.0, 200.0, cfg.K_PH_TO_BASE, 5.0)
+            edits["K_ACID_TO_NAOH_VOL"] = st.number_input("K_ACID_TO_NAOH_VOL (L/meq)", 1e-6, 1e-3, cfg.K_ACID_TO_NAOH_VOL, 1e-6, format="%.2e")
             st.markdown(f'<div class="mono dim" style="font-size:9px;margin-top:8px;">⚠ K-values are theoretical estimates. Pending calibration from operational data.</div>', unsafe_allow_html=True)
 
         with st.expander("Search Parameters"):
-            cfg.ratio_sum_max = st.number_input("ratio_sum_max", 5, 20, cfg.ratio_sum_max, 1)
-            cfg.W_min = st.number_input("W_min (L/min)", 0.1, 5.0, cfg.W_min, 0.1)
+            edits["ratio_sum_max"] = st.number_input("ratio_sum_max", 5, 20, cfg.ratio_sum_max, 1)
+            edits["W_min"] = st.number_input("W_min (L/min)", 0.1, 5.0, cfg.W_min, 0.1)
+
+        cfg = replace(cfg, **edits)
+        st.session_state.cfg = cfg
 
         st.markdown("---")
 
@@ -368,8 +371,7 @@ code/
                             with open(os.path.join(input_dir, sel)) as f:
                                 new_streams, overrides = _load_json(f.read())
                             st.session_state.streams = new_streams
-                            st.session_state.cfg = SystemConfig()
-                            _apply_overrides(st.session_state.cfg, overrides)
+                            st.session_state.cfg = _apply_overrides(SystemConfig(), overrides)
                             st.success(f"✓ {sel}: {len(new_streams)} streams")
                             st.rerun()
                         except Exception as e:
@@ -383,8 +385,7 @@ code/
                 try:
                     new_streams, overrides = _load_json(json_in)
                     st.session_state.streams = new_streams
-                    st.session_state.cfg = SystemConfig()
-                    _apply_overrides(st.session_state.cfg, overrides)
+                    st.session_state.cfg = _apply_overrides(SystemConfig(), overrides)
                     st.success(f"✓ Loaded {len(new_streams)} streams")
                     st.rerun()
                 except Exception as e:
@@ -667,7 +668,7 @@ code/
 
             for i, ph in enumerate(opt.phases):
                 color = STREAM_COLORS[i % len(STREAM_COLORS)]
-                ratio_sum = sum(ph.streams.values())
+                ratio_sum = sum(r for _, r in ph.streams)
                 rt_h = int(ph.runtime_min // 60)
                 rt_m = int(ph.runtime_min % 60)
                 runtime_fmt = f"{rt_h}h {rt_m}m" if rt_h > 0 else f"{rt_m} min"
@@ -681,7 +682,7 @@ code/
                 waste_hdr = f'<div style="{_OP_ROW}display:flex;border-bottom:1px solid {BORDER};"><span style="{_OP_TH}flex:2;">Stream</span><span style="{_OP_TH}flex:1;text-align:right;">Ratio</span><span style="{_OP_TH}flex:1.5;text-align:right;">Feed Rate</span><span style="{_OP_TH}flex:1.5;text-align:right;">Volume</span></div>'
                 st.markdown(waste_hdr, unsafe_allow_html=True)
                 # Table rows
-                for sid, r in ph.streams.items():
+                for sid, r in ph.streams:
                     rate = r / ratio_sum * ph.W
                     vol = r / ratio_sum * ph.Q_phase
                     st.markdown(f'<div style="{_OP_ROW}display:flex;"><span style="{_OP_TD}flex:2;color:{ACCENT};font-weight:600;">{sid}</span><span style="{_OP_TD}flex:1;text-align:right;">×{r}</span><span style="{_OP_TD}flex:1.5;text-align:right;color:{GREEN};font-weight:600;">{rate:.2f} L/min</span><span style="{_OP_TD}flex:1.5;text-align:right;">{vol:.1f} L</span></div>', unsafe_allow_html=True)
@@ -737,7 +738,7 @@ code/
             st.markdown(f'<div style="{_NOTE}">Each waste stream processed independently without blending — serves as cost benchmark.</div>', unsafe_allow_html=True)
             st.markdown("")
             for ph in bl.phases:
-                sid = list(ph.streams.keys())[0]
+                sid = ph.streams[0][0]
                 st.markdown(f'<div style="background:{PANEL_BG};border:1px solid {BORDER};border-radius:6px;padding:14px;margin-bottom:8px;"><span class="mono" style="color:{TEXT_PRI};font-size:13px;font-weight:700;">{sid}</span></div>', unsafe_allow_html=True)
                 st.markdown(f'<div style="background:{PANEL_BG};border-left:1px solid {BORDER};border-right:1px solid {BORDER};padding:4px 14px;"><span class="mono" style="{_LBL}">THROUGHPUT</span> <span class="mono" style="{_VAL}">{ph.W:.2f} L/min</span></div>', unsafe_allow_html=True)
                 st.markdown(f'<div style="background:{PANEL_BG};border-left:1px solid {BORDER};border-right:1px solid {BORDER};padding:4px 14px;"><span class="mono" style="{_LBL}">RUNTIME</span> <span class="mono" style="{_VAL}">{ph.runtime_min:.1f} min</span></div>', unsafe_allow_html=True)
@@ -750,7 +751,7 @@ code/
             st.markdown(f'<div style="color:{TEXT_DIM};font-size:9px;font-style:italic;">Waste streams blended in optimal ratios across multiple phases to minimize total operating cost.</div>', unsafe_allow_html=True)
             st.markdown("")
             for i, ph in enumerate(opt.phases):
-                ratio_str = " + ".join(f"{sid} ×{r}" for sid, r in ph.streams.items())
+                ratio_str = " + ".join(f"{sid} ×{r}" for sid, r in ph.streams)
                 color = STREAM_COLORS[i % len(STREAM_COLORS)]
                 b = ph.blend_props
 
@@ -767,10 +768,10 @@ code/
                 all_ok = solid_ok and salt_ok and w_ok
 
                 # ── Per-stream feed rates ──
-                ratio_sum = sum(ph.streams.values())
+                ratio_sum = sum(r for _, r in ph.streams)
                 feed_details = " + ".join(
                     f"{sid} ×{r} ({r/ratio_sum*ph.W:.2f} L/min)"
-                    for sid, r in ph.streams.items()
+                    for sid, r in ph.streams
                 )
 
                 # ── Additive actual flow rates ──
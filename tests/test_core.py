@@ -1,16 +1,26 @@
 """
 Core module tests: blending, gatekeeper, search
 """
+import importlib
 import math
+import os
+import sys
 import pytest
 
 from smart_feed_v9.models import WasteStream, SystemConfig, BlendProperties
-from smart_feed_v9.blending import blend_linear, blend_pH, calc_blend_properties
+from smart_feed_v9.blending import (
+    blend_linear, blend_pH, calc_blend_properties,
+    calc_blend_properties_batch, stream_matrix, prepare_blend_matrix,
+)
 from smart_feed_v9.gatekeeper import (
     calc_r_water, calc_r_diesel, calc_r_naoh,
-    gatekeeper, calc_throughput, evaluate_phase,
+    gatekeeper, gatekeeper_params, calc_throughput, calc_phase_cost,
+    evaluate_phase,
+    evaluate_phases_batch,
 )
-from smart_feed_v9.search import search
+from smart_feed_v9.ratios import generate_ratios, generate_ratio_array
+from smart_feed_v9 import _kernels
+from smart_feed_v9.search import search, HAVE_NUMBA
 
 
 # ── Common fixtures ──────────────────────────────────────────────
@@ -86,6 +96,24 @@ class TestCalcBlendProperties:
         assert abs(blend.pH - 3.0) < 0.01
 
 
+class TestCalcBlendPropertiesBatch:
+    def test_matches_scalar(self, resin, afff, caustic):
+        streams = [resin, afff, caustic]
+        ratios = [(1, 2, 3), (4, 1, 1)]
+        batch = calc_blend_properties_batch(stream_matrix(streams), ratios)
+        for row, r in zip(batch, ratios):
+            blend = calc_blend_properties(streams, r)
+            assert row == pytest.approx([
+                blend.btu_per_lb, blend.pH, blend.f_ppm,
+                blend.solid_pct, blend.salt_ppm,
+            ], rel=1e-12)
+
+    def test_prepared_h_plus(self, resin, caustic):
+        prepared = prepare_blend_matrix(stream_matrix([resin, caustic]))
+        assert prepared.shape == (2, 5)
+        assert prepared[:, 1] == pytest.approx([1e-3, 10 ** -13.5], rel=1e-12)
+
+
 # ══════════════════════════════════════════════════════════════
 #  gatekeeper.py tests
 # ══════════════════════════════════════════════════════════════
@@ -152,6 +180,28 @@ class TestCalcRNaoh:
         assert calc_r_naoh(blend_base, cfg) < calc_r_naoh(blend_acid, cfg)
 
 
+class TestKernels:
+    def test_fused_matches_adapters(self, cfg):
+        blend = BlendProperties(btu_per_lb=1500, pH=4.2, f_ppm=8000,
+                                solid_pct=40, salt_ppm=6000)
+        rw, rd, rn, W = _kernels.gatekeeper_rates(
+            blend.btu_per_lb, blend.pH, blend.f_ppm,
+            blend.solid_pct, blend.salt_ppm, *gatekeeper_params(cfg)
+        )
+        assert (rw, rd, rn) == gatekeeper(blend, cfg)
+        assert W == calc_throughput(rw, rd, rn, cfg)
+
+
+class TestCalcPhaseCost:
+    def test_material_from_volume(self, cfg):
+        # 100 L at W = 2 L/min → 50 min; materials scale with volume only
+        costs = calc_phase_cost(100.0, 0.5, 0.1, 0.01, 50.0, cfg)
+        assert costs.water == pytest.approx(100.0 * 0.5 * cfg.cost_water_per_L)
+        assert costs.diesel == pytest.approx(100.0 * 0.1 * cfg.cost_diesel_per_L)
+        assert costs.labor == pytest.approx(50.0 / 60.0 * cfg.cost_labor_per_hr)
+        assert costs.total == pytest.approx(sum(costs[:5]))
+
+
 class TestEvaluatePhase:
     def test_feasible(self, afff, cfg):
         inv = {"AFFF": 500}
@@ -177,6 +227,45 @@ class TestEvaluatePhase:
         assert result is None
 
 
+class TestEvaluatePhasesBatch:
+    def test_matches_scalar(self, resin, afff, caustic, cfg):
+        streams = [resin, afff, caustic]
+        ratios = generate_ratio_array(3, cfg.ratio_sum_max)
+        batch = evaluate_phases_batch(
+            prepare_blend_matrix(stream_matrix(streams)), ratios, cfg)
+        inv = {s.stream_id: s.quantity_L for s in streams}
+
+        for i, r in enumerate(ratios.tolist()):
+            phase = evaluate_phase(streams, tuple(r), inv, cfg)
+            assert bool(batch["feasible"][i]) == (phase is not None)
+            if phase is not None:
+                assert batch["W"][i] == pytest.approx(phase.W, rel=1e-12)
+                assert batch["r_naoh"][i] == pytest.approx(phase.r_naoh,
+                                                           rel=1e-9)
+
+
+# ══════════════════════════════════════════════════════════════
+#  ratios.py tests
+# ══════════════════════════════════════════════════════════════
+
+class TestGenerateRatios:
+    @pytest.mark.parametrize("n", [1, 2, 3, 4, 5])
+    def test_matches_bruteforce(self, n):
+        from functools import reduce
+        from itertools import product
+        expected = tuple(
+            c for c in product(range(1, 12 - n + 1), repeat=n)
+            if sum(c) <= 11 and reduce(math.gcd, c) == 1
+        )
+        assert generate_ratios(n, 11) == expected
+        assert tuple(map(tuple, generate_ratio_array(n, 11).tolist())) == expected
+
+    def test_memoized(self):
+        assert generate_ratios(3, 11) is generate_ratios(3, 11)
+        assert generate_ratio_array(3, 11) is generate_ratio_array(3, 11)
+        assert not generate_ratio_array(3, 11).flags.writeable
+
+
 # ══════════════════════════════════════════════════════════════
 #  search.py tests
 # ══════════════════════════════════════════════════════════════
@@ -200,3 +289,224 @@ class TestSearch:
         assert cost < float("inf")
         assert len(phases) >= 1
         assert stats["pruned_bound"] >= 0
+
+    @pytest.mark.skipif(not HAVE_NUMBA, reason="numba not installed")
+    @pytest.mark.parametrize("case", ["3", "4_depleted", "5_tie"])
+    def test_compiled_matches_python(self, case, resin, afff, caustic, cfg,
+                                     monkeypatch):
+        import dataclasses
+        search_module = importlib.import_module("smart_feed_v9.search")
+        if case == "3":
+            streams = [resin, afff, caustic]
+        elif case == "4_depleted":
+            # Rinse starts below the 0.5 L threshold: depleted from the root
+            rinse = WasteStream(
+                stream_id="Rinse", quantity_L=0.3, btu_per_lb=0,
+                pH=7.0, f_ppm=0, solid_pct=0.0, salt_ppm=0, moisture_pct=100,
+            )
+            streams = [resin, afff, caustic, rinse]
+        else:
+            # AFFF-2 duplicates AFFF: equal-cost candidates tie in the sort
+            solvent = WasteStream(
+                stream_id="Solvent", quantity_L=6, btu_per_lb=15000,
+                pH=6.0, f_ppm=0, solid_pct=0.0, salt_ppm=0, moisture_pct=0,
+            )
+            streams = [
+                dataclasses.replace(resin, quantity_L=8),
+                dataclasses.replace(afff, quantity_L=12),
+                dataclasses.replace(caustic, quantity_L=10),
+                dataclasses.replace(afff, stream_id="AFFF-2", quantity_L=12),
+                solvent,
+            ]
+        monkeypatch.setattr(search_module, "_COMPILED_MIN_STREAMS", 1)
+        compiled = search(streams, cfg)
+        monkeypatch.setattr(search_module, "_COMPILED_SEARCH", False)
+        python = search(streams, cfg)
+        assert compiled[0] == python[0]
+        assert compiled[2] == python[2]
+        assert compiled[1] == python[1]
+
+    # (quantity_L, btu_per_lb, pH, f_ppm, solid_pct, salt_ppm) per stream,
+    # and the cost the original, unpruned search finds — PRUNE 3 variants
+    # returned costlier plans on these (175.2063, 57.7659, 251.4608)
+    _UNPRUNED_CASES = [
+        ([(300, 0, 12.0, 15000, 0.0, 0), (150, 5000, 5.0, 15000, 0.5, 200),
+          (100, 18000, 7.5, 5000, 60.0, 3000)], 175.11264397804513),
+        ([(7, 5000, 3.0, 5000, 0.5, 0), (150, 18000, 3.0, 0, 0.0, 3000),
+          (100, 5000, 7.5, 0, 0.0, 8000)], 57.70980357434344),
+        ([(100, 5000, 5.0, 1000, 100.0, 500), (300, 12500, 9.0, 5000, 20.0, 0),
+          (5, 500, 12.0, 1000, 20.0, 200)], 251.4143991853283),
+    ]
+
+    @staticmethod
+    def _streams(rows):
+        return [
+            WasteStream(stream_id=f"S{i}", quantity_L=qty, btu_per_lb=btu,
+                        pH=pH, f_ppm=f, solid_pct=solid, salt_ppm=salt,
+                        moisture_pct=0)
+            for i, (qty, btu, pH, f, solid, salt) in enumerate(rows)
+        ]
+
+    @pytest.mark.parametrize("case", range(3))
+    def test_matches_unpruned_baseline(self, case, cfg):
+        from smart_feed_v9.search import build_optimized_schedule
+        rows, expected = self._UNPRUNED_CASES[case]
+        schedule, _ = build_optimized_schedule(self._streams(rows), cfg)
+        assert schedule.total_cost == expected
+
+    @pytest.mark.parametrize("seed", [1, 2])
+    def test_matches_search_without_prune3(self, seed, cfg, monkeypatch):
+        import random
+        from smart_feed_v9.search import build_optimized_schedule
+        search_module = importlib.import_module("smart_feed_v9.search")
+        rng = random.Random(seed)
+        inputs = [
+            self._streams([
+                (rng.choice([5, 7, 20, 50, 100, 150, 200]),
+                 rng.choice([0, 500, 2000, 5000, 12500, 18000]),
+                 rng.choice([1.0, 3.0, 5.0, 7.0, 9.0, 12.0, 13.5]),
+                 rng.choice([0, 100, 1000, 5000, 15000]),
+                 rng.choice([0.0, 0.5, 5.0, 20.0, 60.0, 100.0]),
+                 rng.choice([0, 200, 500, 3000, 8000]))
+                for _ in range(n_streams)
+            ])
+            for n_streams in (3, 3, 3, 4)
+        ]
+        default = [build_optimized_schedule(st, cfg)[0] for st in inputs]
+        monkeypatch.setattr(search_module, "_LOWER_BOUND_PRUNE", False)
+        for streams, schedule in zip(inputs, default):
+            unpruned, _ = build_optimized_schedule(streams, cfg)
+            assert schedule == unpruned
+
+    def test_small_search_skips_numba_import(self):
+        # Fresh interpreter: this process may have imported numba already
+        import subprocess
+        code = (
+            "import sys\n"
+            "from smart_feed_v9 import WasteStream, SystemConfig, search\n"
+            "s = WasteStream('A', 100, 8000, 7.0, 0, 1.0, 0, 0)\n"
+            "search([s], SystemConfig())\n"
+            "print('numba' in sys.modules)\n"
+        )
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        out = subprocess.run([sys.executable, "-c", code], cwd=root,
+                             check=True, capture_output=True,
+                             text=True).stdout
+        assert out.strip() == "False"
+
+    @pytest.mark.skipif(not HAVE_NUMBA, reason="numba not installed")
+    def test_too_many_streams_for_kernel_key(self, monkeypatch):
+        # 7 streams overflow the kernel's two-word memo key: search() must
+        # fall back to the Python recursion instead of colliding keys
+        import dataclasses
+        search_module = importlib.import_module("smart_feed_v9.search")
+        props = [(12500, 3.0, 15000, 100.0, 500), (800, 8.0, 200, 2.0, 300),
+                 (0, 13.0, 0, 1.0, 6000), (4000, 7.0, 100, 5.0, 100),
+                 (20000, 6.5, 0, 0.0, 0), (1500, 9.0, 50, 10.0, 2000),
+                 (300, 5.0, 3000, 3.0, 1000)]
+        streams = [
+            WasteStream(stream_id=f"S{i}", quantity_L=qty, btu_per_lb=btu,
+                        pH=pH, f_ppm=f, solid_pct=solid, salt_ppm=salt,
+                        moisture_pct=0)
+            for i, ((btu, pH, f, solid, salt), qty)
+            in enumerate(zip(props, [3, 2, 1, 2, 1, 1, 2]))
+        ]
+        small_cfg = dataclasses.replace(SystemConfig(), ratio_sum_max=8)
+
+        def no_kernel(*args):
+            raise AssertionError("run_search called with 7 streams")
+
+        from smart_feed_v9 import _search_kernel
+        monkeypatch.setattr(_search_kernel, "run_search", no_kernel)
+        compiled = search(streams, small_cfg)
+        monkeypatch.setattr(search_module, "_COMPILED_SEARCH", False)
+        python = search(streams, small_cfg)
+        assert compiled[0] == python[0]
+        assert compiled[1] == python[1]
+        assert compiled[2] == python[2]
+
+
+# ══════════════════════════════════════════════════════════════
+#  package API tests
+# ══════════════════════════════════════════════════════════════
+
+class TestPackageExports:
+    def test_names_resolve_to_functions(self):
+        import smart_feed_v9
+        import smart_feed_v9.search  # noqa: F401 — submodule already loaded
+        # `search` / `gatekeeper` are also submodule names: the package
+        # attribute must stay the re-exported function
+        search_module = importlib.import_module("smart_feed_v9.search")
+        assert smart_feed_v9.search is search_module.search
+        assert smart_feed_v9.gatekeeper is gatekeeper
+        assert smart_feed_v9.calc_baseline.__module__ == "smart_feed_v9.baseline"
+
+    def test_star_import(self):
+        import smart_feed_v9
+        namespace = {}
+        exec("from smart_feed_v9 import *", namespace)
+        for name in smart_feed_v9.__all__:
+            assert namespace[name] is getattr(smart_feed_v9, name)
+        assert callable(namespace["search"])
+        assert callable(namespace["run_optimization"])
+        assert "WasteStream" in namespace
+
+
+class TestSystemConfig:
+    def test_frozen(self, cfg):
+        import dataclasses
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            cfg.F_total = 20.0
+        assert dataclasses.replace(cfg, F_total=20.0).F_total == 20.0
+        assert cfg.F_total == SystemConfig().F_total
+
+
+class TestModels:
+    def test_slots(self, resin):
+        # Fields stay assignable (the dashboard edits streams in place),
+        # but there is no per-instance __dict__
+        resin.quantity_L = 250.0
+        assert resin.quantity_L == 250.0
+        assert not hasattr(resin, "__dict__")
+        with pytest.raises(AttributeError):
+            resin.note = "x"
+
+    def test_results_frozen(self, resin, cfg):
+        import dataclasses
+        phase = evaluate_phase([resin], (1,), {"Resin": 200.0}, cfg)
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            phase.cost_total = 0.0
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            phase.blend_props.pH = 7.0
+
+
+# ══════════════════════════════════════════════════════════════
+#  reporter.py tests
+# ══════════════════════════════════════════════════════════════
+
+class TestReport:
+    def test_full_report_writes_formatted_text(self, resin, afff, cfg, capsys):
+        from smart_feed_v9.baseline import calc_baseline
+        from smart_feed_v9.search import build_optimized_schedule
+        from smart_feed_v9.reporter import format_report, full_report
+        streams = [resin, afff]
+        baseline = calc_baseline(streams, cfg)
+        optimized, stats = build_optimized_schedule(streams, cfg)
+        text = format_report(streams, cfg, baseline, optimized, stats)
+        assert "Report complete" in text
+        full_report(streams, cfg, baseline, optimized, stats)
+        assert capsys.readouterr().out == text
+
+    def test_run_optimization_writes_to_out(self, resin, afff, cfg, capsys):
+        import io
+        from smart_feed_v9 import run_optimization
+        buf = io.StringIO()
+        run_optimization([resin, afff], cfg, out=buf)
+        assert "Report complete" in buf.getvalue()
+        assert capsys.readouterr().out == ""
+
+    def test_pct_change(self):
+        from smart_feed_v9.reporter import _pct_change
+        assert _pct_change(10.0, 10.0) == f"{0.0:+.1f}%"
+        assert _pct_change(10.0, 5.0) == "-50.0%"
+        assert _pct_change(0.0, 0.0) == "N/A"